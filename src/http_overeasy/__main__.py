@@ -0,0 +1,119 @@
+"""Command line entry point: python -m http_overeasy bench ..."""
+from __future__ import annotations
+
+import argparse
+import json
+from typing import Any
+from typing import Sequence
+from urllib import parse
+
+from http_overeasy.bench import Bench
+from http_overeasy.bench import RequestTemplate
+from http_overeasy.http_client import HTTPClient
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Internal: Argument parser for all subcommands."""
+    parser = argparse.ArgumentParser(prog="python -m http_overeasy")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    bench = subparsers.add_parser(
+        "bench",
+        help="Generate load against a url and report latency and throughput",
+    )
+    bench.add_argument("url", nargs="?", help="Target url")
+    bench.add_argument("-X", "--method", default="GET", help="HTTP method")
+    body = bench.add_mutually_exclusive_group()
+    body.add_argument("--json", help="JSON object sent as a JSON body")
+    body.add_argument("--data", help="key=value&... sent as a urlencoded body")
+    bench.add_argument(
+        "-H",
+        "--header",
+        action="append",
+        default=[],
+        help="'Name: value' header, repeatable",
+    )
+    bench.add_argument(
+        "--templates",
+        help="JSON file of request templates, used in place of url",
+    )
+    bench.add_argument("-c", "--workers", type=int, default=1)
+    bench.add_argument("-d", "--duration", type=float, default=10.0)
+    bench.add_argument("-w", "--warmup", type=float, default=0.0)
+    bench.add_argument(
+        "-r",
+        "--rate",
+        type=float,
+        default=None,
+        help="Requests per second, open-loop; closed-loop when omitted",
+    )
+    bench.add_argument("-t", "--timeout", type=float, default=None)
+    bench.add_argument("--format", choices=("text", "json"), default="text")
+
+    return parser
+
+
+def _templates(args: argparse.Namespace) -> list[RequestTemplate]:
+    """Internal: Request templates from a templates file or url arguments."""
+    if args.templates:
+        with open(args.templates, encoding="utf-8") as infile:
+            loaded = json.load(infile)
+        loaded = loaded if isinstance(loaded, list) else [loaded]
+        return [RequestTemplate.from_dict(template) for template in loaded]
+
+    if not args.url:
+        raise ValueError("A url or --templates file is required.")
+
+    template: dict[str, Any] = {"method": args.method, "url": args.url}
+    if args.json is not None:
+        template["json"] = json.loads(args.json)
+    if args.data is not None:
+        template["data"] = parse.parse_qs(args.data, keep_blank_values=True)
+
+    headers = {}
+    for header in args.header:
+        name, sep, value = header.partition(":")
+        if not sep:
+            raise ValueError(f"Header must be 'Name: value', got {header!r}")
+        headers[name.strip()] = value.strip()
+    template["headers"] = headers
+
+    return [RequestTemplate.from_dict(template)]
+
+
+def _bench(args: argparse.Namespace) -> int:
+    """Internal: Run the bench subcommand, print report to stdout."""
+    templates = _templates(args)
+    client_kwargs: dict[str, Any] = {"pool_size": args.workers}
+    if args.timeout is not None:
+        client_kwargs["timeout"] = args.timeout
+    client = HTTPClient(**client_kwargs)
+    try:
+        report = Bench(
+            client,
+            templates,
+            workers=args.workers,
+            duration=args.duration,
+            warmup=args.warmup,
+            rate=args.rate,
+        ).run()
+    finally:
+        client.close()
+
+    print(report.to_json() if args.format == "json" else report.to_text())
+    return 0
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Parse arguments and run the requested subcommand."""
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+
+    try:
+        return _bench(args)
+    except (OSError, ValueError) as err:
+        parser.error(str(err))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,328 @@
+"""Load generation through HTTPClient, closed-loop or open-loop."""
+from __future__ import annotations
+
+import itertools
+import json
+import math
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Iterator
+from typing import NamedTuple
+
+from http_overeasy.http_client import HTTPClient
+from http_overeasy.timeouts import HTTPTimeoutError
+
+# Upper edges, in milliseconds, of the latency histogram buckets
+HISTOGRAM_EDGES_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000]
+PERCENTILES = [50, 90, 95, 99, 99.9]
+
+JSON_CONTENT_TYPE = {"content-type": "application/json"}
+URLENCODED_CONTENT_TYPE = {"content-type": "application/x-www-form-urlencoded"}
+
+
+class RequestTemplate(NamedTuple):
+    method: str
+    url: str
+    body: dict[str, Any] | None = None
+    headers: dict[str, str] | None = None
+
+    @classmethod
+    def from_dict(cls, template: dict[str, Any]) -> RequestTemplate:
+        """
+        Build from {"method", "url", "json" | "data", "headers"}.
+
+        A "json" body is sent as JSON, a "data" body is sent urlencoded.
+        """
+        if "json" in template and "data" in template:
+            raise ValueError("Only json or data can be provided, not both.")
+
+        headers = dict(template.get("headers") or {})
+        body = template.get("json") or template.get("data")
+        if "json" in template:
+            headers = {**JSON_CONTENT_TYPE, **headers}
+        elif "data" in template:
+            headers = {**URLENCODED_CONTENT_TYPE, **headers}
+
+        return cls(
+            method=template.get("method", "GET").upper(),
+            url=template["url"],
+            body=body,
+            headers=headers or None,
+        )
+
+
+class Sample(NamedTuple):
+    started: float
+    seconds: float
+    status: int | None
+    error: str | None
+
+
+class BenchReport:
+    def __init__(
+        self,
+        samples: list[Sample],
+        duration: float,
+        mode: str,
+        workers: int,
+        rate: float | None,
+        dropped: int = 0,
+    ) -> None:
+        """
+        Latency, error, and throughput summary of measured samples.
+
+        Args:
+            samples: Requests started in the measured period
+            duration: Seconds from start of measuring to the last completion
+            mode: "closed-loop" or "open-loop"
+            workers: Concurrent requests allowed
+            rate: Target requests per second of an open-loop run
+            dropped: Scheduled requests never started, as no worker was free
+                before the measured period ended
+        """
+        self.samples = samples
+        self.duration = duration
+        self.mode = mode
+        self.workers = workers
+        self.rate = rate
+        self.dropped = dropped
+
+    @property
+    def requests(self) -> int:
+        """Requests completed in the measured period."""
+        return len(self.samples)
+
+    @property
+    def throughput(self) -> float:
+        """Requests completed per second."""
+        return self.requests / self.duration if self.duration > 0 else 0.0
+
+    @property
+    def status_codes(self) -> dict[str, int]:
+        """Count of responses by status code."""
+        counts = Counter(str(s.status) for s in self.samples if s.status is not None)
+        return dict(sorted(counts.items()))
+
+    @property
+    def errors(self) -> dict[str, int]:
+        """Count of failed requests, non-2xx responses included, by cause."""
+        counts: Counter[str] = Counter()
+        for sample in self.samples:
+            if sample.error is not None:
+                counts[sample.error] += 1
+            elif sample.status is not None and not 200 <= sample.status < 300:
+                counts[f"HTTP {sample.status}"] += 1
+        return dict(counts.most_common())
+
+    def percentiles(self) -> dict[str, float]:
+        """Latency percentiles in milliseconds."""
+        latencies = sorted(sample.seconds * 1000 for sample in self.samples)
+        if not latencies:
+            return {}
+
+        result = {}
+        for percentile in PERCENTILES:
+            index = max(math.ceil(len(latencies) * percentile / 100) - 1, 0)
+            result[f"p{percentile:g}"] = round(latencies[index], 3)
+        result["max"] = round(latencies[-1], 3)
+        return result
+
+    def histogram(self) -> dict[str, int]:
+        """Count of requests by latency bucket, keyed by upper edge."""
+        buckets = {f"<={edge}ms": 0 for edge in HISTOGRAM_EDGES_MS}
+        buckets[f">{HISTOGRAM_EDGES_MS[-1]}ms"] = 0
+        for sample in self.samples:
+            milliseconds = sample.seconds * 1000
+            edge = next((e for e in HISTOGRAM_EDGES_MS if milliseconds <= e), None)
+            key = f"<={edge}ms" if edge else f">{HISTOGRAM_EDGES_MS[-1]}ms"
+            buckets[key] += 1
+        return buckets
+
+    def to_dict(self) -> dict[str, Any]:
+        """Report as a JSON serializable dict."""
+        return {
+            "mode": self.mode,
+            "workers": self.workers,
+            "target_rate": self.rate,
+            "duration": round(self.duration, 3),
+            "requests": self.requests,
+            "dropped": self.dropped,
+            "throughput": round(self.throughput, 3),
+            "latency_ms": self.percentiles(),
+            "histogram": self.histogram(),
+            "status_codes": self.status_codes,
+            "errors": self.errors,
+        }
+
+    def to_json(self) -> str:
+        """Report as a JSON string."""
+        return json.dumps(self.to_dict(), indent=4)
+
+    def to_text(self) -> str:
+        """Report as human readable text."""
+        report = self.to_dict()
+        target = f", target {self.rate:g} req/s" if self.rate else ""
+        lines = [
+            f"Mode: {self.mode} ({self.workers} workers{target})",
+            f"Duration: {report['duration']}s",
+            f"Requests: {self.requests}",
+            f"Dropped: {self.dropped}",
+            f"Throughput: {report['throughput']} req/s",
+            "",
+            "Latency (ms):",
+        ]
+        lines.extend(f"  {k:>6}: {v}" for k, v in report["latency_ms"].items())
+
+        lines.extend(["", "Histogram:"])
+        most = max(report["histogram"].values() or [0]) or 1
+        for bucket, count in report["histogram"].items():
+            bar = "#" * math.ceil(40 * count / most) if count else ""
+            lines.append(f"  {bucket:>9} {count:>8} {bar}")
+
+        lines.extend(["", "Status codes:"])
+        lines.extend(f"  {k}: {v}" for k, v in report["status_codes"].items())
+        lines.extend(["", "Errors:"])
+        lines.extend(f"  {k}: {v}" for k, v in report["errors"].items())
+        if not report["errors"]:
+            lines.append("  none")
+
+        return "\n".join(lines)
+
+
+class Bench:
+    def __init__(
+        self,
+        client: HTTPClient,
+        templates: list[RequestTemplate],
+        *,
+        workers: int = 1,
+        duration: float = 10.0,
+        warmup: float = 0.0,
+        rate: float | None = None,
+    ) -> None:
+        """
+        Send templated requests through a client and measure them.
+
+        Closed-loop: each of `workers` sends its next request as soon as the
+        last one finished. Open-loop: requests are scheduled at `rate` per
+        second, no matter how long earlier ones take, on up to `workers`
+        threads. Scheduled requests still waiting for a worker when the
+        measured period ends are dropped, not sent.
+
+        Args:
+            client: Client all requests are sent through
+            templates: Requests to send, in rotation
+            workers: Concurrent requests allowed
+            duration: Seconds measured, after warm-up
+            warmup: Seconds of traffic sent before measuring starts
+            rate: Requests per second, runs open-loop when set
+        """
+        if not templates:
+            raise ValueError("At least one request template is required.")
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if rate is not None and rate <= 0:
+            raise ValueError("rate must be greater than 0")
+
+        self.client = client
+        self.templates = templates
+        self.workers = workers
+        self.duration = duration
+        self.warmup = warmup
+        self.rate = rate
+
+        self._samples: list[Sample] = []
+        self._dropped = 0
+        self._lock = threading.Lock()
+        self._rotation: Iterator[RequestTemplate] = itertools.cycle(templates)
+
+    def run(self) -> BenchReport:
+        """Run warm-up and measured period, returns report of measured period."""
+        self._samples = []
+        self._dropped = 0
+        started = time.monotonic()
+        measure_from = started + self.warmup
+        stop_at = measure_from + self.duration
+
+        if self.rate is None:
+            self._closed_loop(stop_at)
+        else:
+            self._open_loop(started, measure_from, stop_at, self.rate)
+
+        measured = [s for s in self._samples if s.started >= measure_from]
+        return BenchReport(
+            samples=measured,
+            # Requests in flight at stop_at run past it, count the real time
+            duration=max(time.monotonic() - measure_from, self.duration),
+            mode="closed-loop" if self.rate is None else "open-loop",
+            workers=self.workers,
+            rate=self.rate,
+            dropped=self._dropped,
+        )
+
+    def _closed_loop(self, stop_at: float) -> None:
+        """Internal: Each worker sends back-to-back until stop_at."""
+
+        def work() -> None:
+            while time.monotonic() < stop_at:
+                self._send(time.monotonic())
+
+        threads = [threading.Thread(target=work) for _ in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def _open_loop(
+        self,
+        started: float,
+        measure_from: float,
+        stop_at: float,
+        rate: float,
+    ) -> None:
+        """Internal: Start requests on a fixed schedule until stop_at."""
+
+        def work(scheduled: float) -> None:
+            # An overloaded target leaves a backlog, don't send it past stop_at
+            if time.monotonic() >= stop_at:
+                with self._lock:
+                    self._dropped += scheduled >= measure_from
+                return
+            # Latency counts from the scheduled start, queueing included
+            self._send(scheduled)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for count in itertools.count():
+                scheduled = started + count / rate
+                if scheduled >= stop_at:
+                    break
+                time.sleep(max(scheduled - time.monotonic(), 0))
+                executor.submit(work, scheduled)
+
+    def _send(self, started: float) -> None:
+        """Internal: Send the next templated request and record it."""
+        with self._lock:
+            template = next(self._rotation)
+
+        status = None
+        error = None
+        try:
+            resp = self.client._request_handler(
+                template.method,
+                template.url,
+                template.body,
+                None,
+                template.headers,
+            )
+            status = resp.status_code
+        except HTTPTimeoutError as err:
+            error = f"{type(err).__name__}({err.phase})"
+        except Exception as err:
+            error = type(err).__name__
+
+        sample = Sample(started, time.monotonic() - started, status, error)
+        with self._lock:
+            self._samples.append(sample)
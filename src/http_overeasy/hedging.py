@@ -0,0 +1,95 @@
+"""Policy for hedging slow idempotent requests."""
+from __future__ import annotations
+
+import math
+import threading
+from collections import deque
+
+HEDGE_DELAY = 0.1
+HEDGE_MIN_SAMPLES = 20
+HEDGE_SAMPLE_SIZE = 100
+HEDGE_MAX_RATIO = 0.1
+HEDGE_BURST = 10.0
+HEDGE_MAX_WORKERS = 32
+
+
+class HedgePolicy:
+    def __init__(
+        self,
+        *,
+        delay: float = HEDGE_DELAY,
+        percentile: float | None = None,
+        min_samples: int = HEDGE_MIN_SAMPLES,
+        sample_size: int = HEDGE_SAMPLE_SIZE,
+        max_ratio: float = HEDGE_MAX_RATIO,
+        burst: float = HEDGE_BURST,
+        max_workers: int = HEDGE_MAX_WORKERS,
+    ) -> None:
+        """
+        Decide when a second, identical, request is sent for a slow call.
+
+        Args:
+            delay: Seconds to wait for a response before hedging
+            percentile: When set, delay is the observed per-host percentile
+                (e.g. 95) of response times once `min_samples` are recorded
+            min_samples: Samples needed before the percentile delay is used
+            sample_size: Number of recent response times kept per host
+            max_ratio: Hedges allowed per request sent (0.1 == 10%)
+            burst: Maximum hedges that can be saved up by quiet periods
+            max_workers: Threads available to send hedges. Only hedges are
+                limited, each original request runs on its own thread
+        """
+        if percentile is not None and not 0 < percentile <= 100:
+            raise ValueError("percentile must be between 0 and 100")
+
+        self.delay = delay
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.max_ratio = max_ratio
+        self.burst = burst
+        self.max_workers = max_workers
+        self.hedged = 0
+
+        self._sample_size = sample_size
+        self._samples: dict[str, deque[float]] = {}
+        self._tokens = burst
+        self._lock = threading.Lock()
+
+    def _reset_after_fork(self) -> None:
+        """Internal: New lock in a forked child, the parent's may be held."""
+        self._lock = threading.Lock()
+
+    def delay_for(self, host: str) -> float:
+        """Seconds to wait on host before a hedge is sent."""
+        if self.percentile is None:
+            return self.delay
+
+        with self._lock:
+            samples = sorted(self._samples.get(host, ()))
+
+        if len(samples) < self.min_samples:
+            return self.delay
+
+        index = math.ceil(len(samples) * self.percentile / 100) - 1
+        return samples[max(index, 0)]
+
+    def record(self, host: str, seconds: float) -> None:
+        """Record the response time of a request to host."""
+        with self._lock:
+            if host not in self._samples:
+                self._samples[host] = deque(maxlen=self._sample_size)
+            self._samples[host].append(seconds)
+
+    def request_started(self) -> None:
+        """Earn a fraction of a hedge for each request sent."""
+        with self._lock:
+            self._tokens = min(self._tokens + self.max_ratio, self.burst)
+
+    def try_acquire(self) -> bool:
+        """True, and spends a hedge, if the hedge rate cap allows one more."""
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            self.hedged += 1
+            return True
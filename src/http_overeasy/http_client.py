@@ -2,11 +2,48 @@ from __future__ import annotations
 
 import json
 import logging
+import os
+import ssl
+import threading
+import time
+import weakref
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
 from typing import Any
+from typing import Callable
+from typing import Iterable
 from urllib import parse
 
 import urllib3
+from http_overeasy.hedging import HedgePolicy
+from http_overeasy.pools import POOL_CLASSES_BY_SCHEME
+from http_overeasy.pools import reap_idle
+from http_overeasy.pools import reap_idle_pool
+from http_overeasy.pools import warm_pool
+from http_overeasy.proxies import bypass_proxy
+from http_overeasy.proxies import PROXY_SCHEMES
+from http_overeasy.proxies import proxy_manager
+from http_overeasy.proxies import resolve_proxies
 from http_overeasy.response import Response
+from http_overeasy.timeouts import DeadlineRetry
+from http_overeasy.timeouts import DeadlineTimeout
+from http_overeasy.timeouts import HTTPTimeoutError
+from http_overeasy.timeouts import split_timeout
+from http_overeasy.timeouts import TIMEOUT_CONNECT
+from http_overeasy.timeouts import TIMEOUT_READ
+from http_overeasy.timeouts import timeout_phase
+from http_overeasy.timeouts import TimeoutType
+from http_overeasy.tls import build_ssl_context
+from http_overeasy.tls import SessionCachingContext
+from http_overeasy.tls import TLSStats
+from http_overeasy.unix import unix_target
+from http_overeasy.unix import UnixHTTPConnectionPool
+from http_overeasy.unix import UnixTarget
+from urllib3.connectionpool import HTTPConnectionPool
+from urllib3.exceptions import MaxRetryError
+from urllib3.response import HTTPResponse
 
 RETRY_TOTAL = 3
 RETRY_BACKOFF_FACTOR = 2
@@ -14,6 +51,10 @@ RETRY_RAISE_ON_STATUS = False
 RETRY_RAISE_ON_REDIRECT = True
 RETRY_STATUS_FORCELIST = [500, 502, 503, 504]
 RETRY_ALLOWED_METHODS = ["GET", "POST", "PUT", "PATCH", "DELETE"]
+HEDGE_ALLOWED_METHODS = ["GET"]
+
+# Every client is checked, and rebuilt if needed, in a freshly forked child
+_CLIENTS: weakref.WeakSet[HTTPClient] = weakref.WeakSet()
 
 
 class HTTPClient:
@@ -24,23 +65,188 @@ class HTTPClient:
         *,
         headers: dict[str, str] | None = None,
         max_pool: int = 10,
+        hedge: HedgePolicy | None = None,
+        timeout: TimeoutType | None = (TIMEOUT_CONNECT, TIMEOUT_READ),
+        deadline: float | None = None,
+        after_fork: Callable[[HTTPClient], None] | None = None,
+        pool_size: int = 1,
+        idle_ttl: float | None = None,
+        proxy: str | None = None,
+        no_proxy: str | None = None,
+        trust_env: bool = True,
+        ssl_context: ssl.SSLContext | None = None,
+        ca_bundle: str | None = None,
+        unix_sockets: dict[str, str] | None = None,
     ) -> None:
         self.log = logging.getLogger(__name__)
+        self.unix_sockets = {
+            host.lower(): path for host, path in (unix_sockets or {}).items()
+        }
+        self.unix_pools: dict[UnixTarget, UnixHTTPConnectionPool] = {}
+        self._unix_lock = threading.Lock()
+        self.ssl_context = ssl_context or build_ssl_context(ca_bundle)
+        self.timeout = timeout
+        self.deadline = deadline
+        self.pool_size = pool_size
+        self.idle_ttl = idle_ttl
+        self.proxy_urls = resolve_proxies(proxy, no_proxy, trust_env)
         self.http = self._connection(max_pool)
+        self.proxies = self._proxy_connections(max_pool)
         self.headers = self._format_headers(headers) if headers else None
+        self.hedge = hedge
+        self.after_fork = after_fork
+        self._hedge_executor: ThreadPoolExecutor | None = None
+        self._hedge_lock = threading.Lock()
+        self._max_pool = max_pool
+        self._pid = os.getpid()
+        self._after_fork_pending = False
+        self._fork_lock = threading.Lock()
+        self._reaper_stop = threading.Event()
+        _CLIENTS.add(self)
+
+        if idle_ttl is not None:
+            self._start_reaper(idle_ttl)
 
     def _connection(self, max_pool: int) -> urllib3.PoolManager:
-        """Returns HTTP pool manager with retries and backoff"""
-        return urllib3.PoolManager(
-            num_pools=max_pool,
-            retries=urllib3.Retry(
-                total=RETRY_TOTAL,
-                backoff_factor=RETRY_BACKOFF_FACTOR,
-                raise_on_status=RETRY_RAISE_ON_STATUS,
-                raise_on_redirect=RETRY_RAISE_ON_REDIRECT,
-                status_forcelist=RETRY_STATUS_FORCELIST,
-                allowed_methods=RETRY_ALLOWED_METHODS,
-            ),
+        """Returns HTTP pool manager with retries, backoff, and timeouts"""
+        manager = urllib3.PoolManager(**self._pool_kwargs(max_pool))
+        manager.pool_classes_by_scheme = POOL_CLASSES_BY_SCHEME
+        return manager
+
+    def _proxy_connections(self, max_pool: int) -> dict[str, urllib3.ProxyManager]:
+        """Returns proxy pool managers by target scheme, shared if same proxy"""
+        managers: dict[str, urllib3.ProxyManager] = {}
+        proxies: dict[str, urllib3.ProxyManager] = {}
+        for scheme in PROXY_SCHEMES:
+            url = self.proxy_urls.get(scheme)
+            if not url:
+                continue
+            if url not in managers:
+                try:
+                    managers[url] = proxy_manager(url, **self._pool_kwargs(max_pool))
+                except (ValueError, urllib3.exceptions.HTTPError) as err:
+                    self.log.warning("Ignoring %s proxy %s: %s", scheme, url, err)
+                    continue
+            proxies[scheme] = managers[url]
+        return proxies
+
+    def _unix_connection(self, target: UnixTarget) -> UnixHTTPConnectionPool:
+        """Returns keep-alive pool for a Unix domain socket, created once"""
+        key = target._replace(path="")
+        with self._unix_lock:
+            if key not in self.unix_pools:
+                connect, read = split_timeout(self.timeout)
+                self.unix_pools[key] = UnixHTTPConnectionPool(
+                    target.host,
+                    target.socket_path,
+                    maxsize=self.pool_size,
+                    retries=self._retries(),
+                    timeout=urllib3.Timeout(connect=connect, read=read),
+                )
+            return self.unix_pools[key]
+
+    def _pool_kwargs(self, max_pool: int) -> dict[str, Any]:
+        """Internal: Keyword arguments shared by all pool managers."""
+        connect, read = split_timeout(self.timeout)
+        return {
+            "num_pools": max_pool,
+            "maxsize": self.pool_size,
+            "ssl_context": self.ssl_context,
+            "retries": self._retries(),
+            "timeout": urllib3.Timeout(connect=connect, read=read),
+        }
+
+    @property
+    def tls_stats(self) -> TLSStats | None:
+        """TLS handshakes made and resumed, None for a user provided context."""
+        if isinstance(self.ssl_context, SessionCachingContext):
+            return self.ssl_context.stats
+        return None
+
+    def _route(
+        self,
+        url: str,
+    ) -> tuple[urllib3.PoolManager | UnixHTTPConnectionPool, str]:
+        """Internal: Pool manager, or Unix socket pool, and url to request."""
+        target = unix_target(url, self.unix_sockets)
+        if target is not None:
+            return self._unix_connection(target), target.path
+        return self._manager_for(url), url
+
+    def _manager_for(self, url: str) -> urllib3.PoolManager:
+        """Internal: Pool manager, direct or through a proxy, for the url."""
+        scheme = parse.urlsplit(url).scheme.lower()
+        manager = self.proxies.get(scheme)
+        if manager is None or bypass_proxy(url, self.proxy_urls):
+            return self.http
+        return manager
+
+    def _managers(self) -> list[urllib3.PoolManager]:
+        """Internal: All pool managers of the client."""
+        managers = [self.http]
+        for manager in self.proxies.values():
+            if manager not in managers:
+                managers.append(manager)
+        return managers
+
+    def warm(self, hosts: Iterable[str], *, connections_per_host: int = 1) -> int:
+        """
+        Open keep-alive connections to hosts ahead of traffic.
+
+        Args:
+            hosts: URLs of target hosts, e.g. "https://example.com"
+            connections_per_host: Connections to park, capped by pool_size
+
+        Returns:
+            Number of open connections parked across all hosts
+        """
+        self._check_fork()
+        opened = 0
+        for host in hosts:
+            try:
+                target = unix_target(host, self.unix_sockets)
+                pool: HTTPConnectionPool
+                if target is not None:
+                    pool = self._unix_connection(target)
+                else:
+                    pool = self._manager_for(host).connection_from_url(host)
+                opened += warm_pool(pool, connections_per_host)
+            except (OSError, urllib3.exceptions.HTTPError) as err:
+                self.log.warning("Failed to warm connections to %s: %s", host, err)
+        return opened
+
+    def close(self) -> None:
+        """Stop the idle reaper and close all pooled connections."""
+        self._reaper_stop.set()
+        for manager in self._managers():
+            manager.clear()
+        with self._unix_lock:
+            for pool in self.unix_pools.values():
+                pool.close()
+            self.unix_pools = {}
+
+    def _start_reaper(self, idle_ttl: float) -> None:
+        """Internal: Close idle connections from a daemon thread."""
+        self._reaper_stop = threading.Event()
+        thread = threading.Thread(
+            target=_reap_idle_connections,
+            args=(weakref.ref(self), self._reaper_stop, idle_ttl),
+            name="http_overeasy_reaper",
+            daemon=True,
+        )
+        thread.start()
+
+    @staticmethod
+    def _retries(expires: float | None = None) -> DeadlineRetry:
+        """Returns retry policy, optionally bound to a monotonic deadline"""
+        return DeadlineRetry(
+            total=RETRY_TOTAL,
+            backoff_factor=RETRY_BACKOFF_FACTOR,
+            raise_on_status=RETRY_RAISE_ON_STATUS,
+            raise_on_redirect=RETRY_RAISE_ON_REDIRECT,
+            status_forcelist=RETRY_STATUS_FORCELIST,
+            allowed_methods=RETRY_ALLOWED_METHODS,
+            expires=expires,
         )
 
     def get(
@@ -49,6 +255,8 @@ class HTTPClient:
         *,
         fields: dict[str, Any] | None = None,
         headers: dict[str, str] | None = None,
+        timeout: TimeoutType | None = None,
+        deadline: float | None = None,
     ) -> Response:
         """
         GET method with Response model returned
@@ -57,11 +265,15 @@ class HTTPClient:
             url: HTTPS URL of target
             fields: {key:value} dict of fields to be translated to urlecoded string
             headers: Optional headers to use over global headers
+            timeout: Optional seconds, or (connect, read), to use over global
+            deadline: Optional seconds for all attempts, to use over global
 
         Returns:
             Response
         """
-        return self._request_handler("GET", url, None, fields, headers)
+        return self._request_handler(
+            "GET", url, None, fields, headers, timeout, deadline
+        )
 
     def delete(
         self,
@@ -69,6 +281,8 @@ class HTTPClient:
         *,
         fields: dict[str, Any] | None = None,
         headers: dict[str, str] | None = None,
+        timeout: TimeoutType | None = None,
+        deadline: float | None = None,
     ) -> Response:
         """
         DELETE method with Response model returned
@@ -77,11 +291,15 @@ class HTTPClient:
             url: HTTPS URL of target
             fields: {key:value} dict of fields to be translated to urlecoded string
             headers: Optional headers to use over global headers
+            timeout: Optional seconds, or (connect, read), to use over global
+            deadline: Optional seconds for all attempts, to use over global
 
         Returns:
             Response
         """
-        return self._request_handler("DELETE", url, None, fields, headers)
+        return self._request_handler(
+            "DELETE", url, None, fields, headers, timeout, deadline
+        )
 
     def post(
         self,
@@ -90,6 +308,8 @@ class HTTPClient:
         json: dict[str, Any] | None = None,
         fields: dict[str, Any] | None = None,
         headers: dict[str, str] | None = None,
+        timeout: TimeoutType | None = None,
+        deadline: float | None = None,
     ) -> Response:
         """
         POST method with Response model returned
@@ -101,12 +321,16 @@ class HTTPClient:
             json: {key:value} dict of payload to be delivered
             fields: {key:value} dict of fields to be translated to urlecoded string
             headers: Optional headers to use over global headers
+            timeout: Optional seconds, or (connect, read), to use over global
+            deadline: Optional seconds for all attempts, to use over global
             urlencode: When true, body is sent as urlencoded string
 
         Returns:
             Response
         """
-        return self._request_handler("POST", url, json, fields, headers)
+        return self._request_handler(
+            "POST", url, json, fields, headers, timeout, deadline
+        )
 
     def put(
         self,
@@ -115,6 +339,8 @@ class HTTPClient:
         json: dict[str, Any] | None = None,
         fields: dict[str, Any] | None = None,
         headers: dict[str, str] | None = None,
+        timeout: TimeoutType | None = None,
+        deadline: float | None = None,
     ) -> Response:
         """
         PUT method with Response model returned
@@ -126,12 +352,16 @@ class HTTPClient:
             json: {key:value} dict of payload to be delivered
             fields: {key:value} dict of fields to be translated to urlecoded string
             headers: Optional headers to use over global headers
+            timeout: Optional seconds, or (connect, read), to use over global
+            deadline: Optional seconds for all attempts, to use over global
             urlencode: When true, body is sent as urlencoded string
 
         Returns:
             Response
         """
-        return self._request_handler("PUT", url, json, fields, headers)
+        return self._request_handler(
+            "PUT", url, json, fields, headers, timeout, deadline
+        )
 
     def patch(
         self,
@@ -140,6 +370,8 @@ class HTTPClient:
         json: dict[str, Any] | None = None,
         fields: dict[str, Any] | None = None,
         headers: dict[str, str] | None = None,
+        timeout: TimeoutType | None = None,
+        deadline: float | None = None,
     ) -> Response:
         """
         PATCH method with Response model returned
@@ -151,12 +383,16 @@ class HTTPClient:
             body: {key:value} dict of payload to be delivered
             fields: {key:value} dict of fields to be translated to urlecoded string
             headers: Optional headers to use over global headers
+            timeout: Optional seconds, or (connect, read), to use over global
+            deadline: Optional seconds for all attempts, to use over global
             urlencode: When true, body is sent as urlencoded string
 
         Returns:
             Response
         """
-        return self._request_handler("PATCH", url, json, fields, headers)
+        return self._request_handler(
+            "PATCH", url, json, fields, headers, timeout, deadline
+        )
 
     def _request_handler(
         self,
@@ -165,8 +401,11 @@ class HTTPClient:
         body: dict[str, Any] | None = None,
         fields: dict[str, Any] | None = None,
         headers: dict[str, str] | None = None,
+        timeout: TimeoutType | None = None,
+        deadline: float | None = None,
     ) -> Response:
         """Internal: Handles request and returns Response model."""
+        self._check_fork()
         headers = self._format_headers(headers) if headers is not None else self.headers
         request_body = None
 
@@ -177,15 +416,186 @@ class HTTPClient:
             else:
                 request_body = json.dumps(body)
 
-        resp = self.http.request(
-            method=method.upper(),
-            url=url,
-            body=request_body,
-            fields=fields if not request_body else None,
-            headers=headers,
+        request_kwargs: dict[str, Any] = {
+            "method": method.upper(),
+            "url": url,
+            "body": request_body,
+            "fields": fields if not request_body else None,
+            "headers": headers,
+        }
+        request_kwargs.update(self._timeout_kwargs(timeout, deadline))
+
+        try:
+            if self.hedge is not None and method.upper() in HEDGE_ALLOWED_METHODS:
+                resp = self._hedged_request(self.hedge, request_kwargs)
+            else:
+                resp = self._send(request_kwargs)
+
+            return Response(resp)
+
+        except (MaxRetryError, urllib3.exceptions.TimeoutError) as err:
+            phase = timeout_phase(err)
+            if phase is None:
+                raise
+            if isinstance(err, MaxRetryError):
+                reason, pool = err.reason or err, err.pool
+            else:
+                reason, pool = err, None
+            raise HTTPTimeoutError(phase, url, reason, pool) from err
+
+    def _timeout_kwargs(
+        self,
+        timeout: TimeoutType | None,
+        deadline: float | None,
+    ) -> dict[str, Any]:
+        """Internal: Per-call timeout and retries, empty when defaults apply."""
+        deadline = deadline if deadline is not None else self.deadline
+        if timeout is None and deadline is None:
+            return {}
+
+        connect, read = split_timeout(timeout if timeout is not None else self.timeout)
+        if deadline is None:
+            return {"timeout": urllib3.Timeout(connect=connect, read=read)}
+
+        expires = time.monotonic() + deadline
+        return {
+            "timeout": DeadlineTimeout(connect, read, expires),
+            "retries": self._retries(expires),
+        }
+
+    def _hedged_request(
+        self,
+        policy: HedgePolicy,
+        request_kwargs: dict[str, Any],
+    ) -> HTTPResponse:
+        """Internal: Send a second request if the first is slow, first one wins."""
+        host = parse.urlsplit(request_kwargs["url"]).netloc
+        policy.request_started()
+
+        running = threading.Event()
+        started = 0.0
+
+        def _send_primary() -> HTTPResponse:
+            nonlocal started
+            started = time.monotonic()
+            running.set()
+            return self._send_unloaded(request_kwargs)
+
+        def _record(future: Future[HTTPResponse]) -> None:
+            if future.exception() is None:
+                policy.record(host, time.monotonic() - started)
+
+        # Primaries are never queued, only hedges share the bounded executor
+        primary = self._start_primary(_send_primary)
+        primary.add_done_callback(_record)
+
+        # Delay counts from when the request is sent, not from when it was asked
+        running.wait()
+        delay = policy.delay_for(host) - (time.monotonic() - started)
+        done, _ = wait([primary], timeout=max(delay, 0))
+        if done or not policy.try_acquire():
+            return primary.result()
+
+        self.log.debug("Hedging %s request to %s", request_kwargs["method"], host)
+        hedge = self._get_hedge_executor(policy).submit(
+            self._send_unloaded, request_kwargs
         )
+        pending = {primary, hedge}
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            winners = [future for future in done if future.exception() is None]
+            if winners:
+                for future in pending | (done - {winners[0]}):
+                    if not future.cancel():
+                        future.add_done_callback(self._discard_response)
+                return winners[0].result()
+
+        # Both requests failed, surface the error of the original request
+        return primary.result()
+
+    def _check_fork(self) -> None:
+        """Internal: Rebuild if in a forked child, then run after_fork once."""
+        if os.getpid() != self._pid:
+            self._reset_after_fork()
+
+        if self._after_fork_pending:
+            with self._fork_lock:
+                pending, self._after_fork_pending = self._after_fork_pending, False
+            if pending and self.after_fork is not None:
+                try:
+                    self.after_fork(self)
+                except Exception:
+                    self.log.exception(
+                        "after_fork callback failed in pid %d", os.getpid()
+                    )
 
-        return Response(resp)
+    def _reset_after_fork(self) -> None:
+        """Internal: Replace pools and locks copied from the parent process."""
+        pid = os.getpid()
+        # Sockets and threads of the parent are never touched, only dropped
+        self.log.debug("Fork detected (pid %d), rebuilding connection pools", pid)
+        self.http = self._connection(self._max_pool)
+        self.proxies = self._proxy_connections(self._max_pool)
+        self.unix_pools = {}
+        self._unix_lock = threading.Lock()
+        self._hedge_executor = None
+        self._hedge_lock = threading.Lock()
+        self._fork_lock = threading.Lock()
+        # A parent thread may have held these mid-fork, they would never unlock
+        if self.hedge is not None:
+            self.hedge._reset_after_fork()
+        if isinstance(self.ssl_context, SessionCachingContext):
+            self.ssl_context._reset_after_fork()
+        self._pid = pid
+        # Deferred to the first request, no network I/O inside the fork hook
+        self._after_fork_pending = self.after_fork is not None
+
+        if self.idle_ttl is not None:
+            self._start_reaper(self.idle_ttl)
+
+    def _send(self, request_kwargs: dict[str, Any], **urlopen_kw: Any) -> HTTPResponse:
+        """Internal: Send request through the pools that serve its url."""
+        requester, url = self._route(request_kwargs["url"])
+        return requester.request(**{**request_kwargs, "url": url}, **urlopen_kw)
+
+    def _send_unloaded(self, request_kwargs: dict[str, Any]) -> HTTPResponse:
+        """Internal: Send request, body is left on the connection until read."""
+        return self._send(request_kwargs, preload_content=False)
+
+    @staticmethod
+    def _start_primary(send: Callable[[], HTTPResponse]) -> Future[HTTPResponse]:
+        """Internal: Run send on its own thread, one per caller, as a Future."""
+        future: Future[HTTPResponse] = Future()
+
+        def run() -> None:
+            future.set_running_or_notify_cancel()
+            try:
+                future.set_result(send())
+            except BaseException as err:
+                future.set_exception(err)
+
+        threading.Thread(target=run, name="http_overeasy_request", daemon=True).start()
+        return future
+
+    def _get_hedge_executor(self, policy: HedgePolicy) -> ThreadPoolExecutor:
+        """Internal: Lazy load the thread pool hedged requests are sent from."""
+        with self._hedge_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(
+                    max_workers=policy.max_workers,
+                    thread_name_prefix="http_overeasy_hedge",
+                )
+            return self._hedge_executor
+
+    @staticmethod
+    def _discard_response(future: Future[HTTPResponse]) -> None:
+        """Internal: Close the losing response and drop its connection."""
+        if future.cancelled() or future.exception() is not None:
+            return
+        resp = future.result()
+        resp.close()
+        resp.release_conn()
 
     @staticmethod
     def _is_urlencoded(headers: dict[str, str] | None) -> bool:
@@ -198,3 +608,31 @@ class HTTPClient:
     def _format_headers(headers: dict[str, str]) -> dict[str, str]:
         """Adjust all keys to lower-case"""
         return {key.lower(): value for key, value in headers.items()}
+
+
+def _reap_idle_connections(
+    client_ref: weakref.ref[HTTPClient],
+    stop: threading.Event,
+    idle_ttl: float,
+) -> None:
+    """Close idle connections of the client every quarter ttl until stopped."""
+    while not stop.wait(idle_ttl / 4):
+        client = client_ref()
+        if client is None:
+            return
+        for manager in client._managers():
+            reap_idle(manager, idle_ttl)
+        for pool in list(client.unix_pools.values()):
+            reap_idle_pool(pool, idle_ttl)
+        del client
+
+
+def _after_fork_in_child() -> None:
+    """Rebuild all clients in the child right away, not on first request."""
+    for client in list(_CLIENTS):
+        if client._pid != os.getpid():
+            client._reset_after_fork()
+
+
+if hasattr(os, "register_at_fork"):  # pragma: no cover
+    os.register_at_fork(after_in_child=_after_fork_in_child)
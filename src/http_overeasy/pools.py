@@ -0,0 +1,150 @@
+"""Connection pools that can be warmed ahead of traffic and reaped when idle."""
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any
+
+import urllib3
+from urllib3.connectionpool import HTTPConnectionPool
+from urllib3.connectionpool import HTTPSConnectionPool
+from urllib3.util.proxy import connection_requires_http_tunnel
+
+# Attribute set on a connection each time it is returned to its pool
+_IDLE_SINCE = "_overeasy_idle_since"
+
+log = logging.getLogger(__name__)
+
+
+class IdleTrackingHTTPConnectionPool(HTTPConnectionPool):
+    """HTTP pool that records when each connection was parked."""
+
+    def _put_conn(self, conn: Any) -> None:
+        if conn is not None:
+            setattr(conn, _IDLE_SINCE, time.monotonic())
+        super()._put_conn(conn)
+
+
+class IdleTrackingHTTPSConnectionPool(HTTPSConnectionPool):
+    """HTTPS pool that records when each connection was parked."""
+
+    def _put_conn(self, conn: Any) -> None:
+        if conn is not None:
+            setattr(conn, _IDLE_SINCE, time.monotonic())
+        super()._put_conn(conn)
+
+
+POOL_CLASSES_BY_SCHEME = {
+    "http": IdleTrackingHTTPConnectionPool,
+    "https": IdleTrackingHTTPSConnectionPool,
+}
+
+
+def warm_pool(pool: HTTPConnectionPool, connections: int) -> int:
+    """
+    Open connections and park them, keep-alive, in the pool.
+
+    Connections already open in the pool count toward the total. Pools behind
+    a proxy open a CONNECT tunnel, as a request would, when the target needs one.
+
+    Args:
+        pool: Connection pool of the target host
+        connections: Number of connections wanted
+
+    Returns:
+        Number of open connections parked in the pool
+    """
+    maxsize = pool.pool.maxsize if pool.pool is not None else 0
+    if connections > maxsize:
+        log.warning(
+            "Pool for %s only keeps %d connections, %d requested",
+            pool.host,
+            maxsize,
+            connections,
+        )
+        connections = maxsize
+
+    conns: list[Any] = []
+    try:
+        for _ in range(connections):
+            conn = pool._get_conn()
+            conns.append(conn)
+            if getattr(conn, "sock", None) is None:
+                try:
+                    _connect(pool, conn)
+                except BaseException:
+                    # A failed connect can leave a closed socket behind
+                    conn.close()
+                    conns[-1] = None
+                    raise
+    finally:
+        for conn in conns:
+            pool._put_conn(conn)
+
+    return sum(getattr(conn, "sock", None) is not None for conn in conns)
+
+
+def _connect(pool: HTTPConnectionPool, conn: Any) -> None:
+    """Internal: Connect as a request would, through a CONNECT tunnel if proxied."""
+    if pool.proxy is not None and connection_requires_http_tunnel(
+        pool.proxy, pool.proxy_config, pool.scheme
+    ):
+        pool._prepare_proxy(conn)
+    else:
+        conn.connect()
+
+
+def reap_idle(manager: urllib3.PoolManager, ttl: float) -> int:
+    """
+    Close pooled connections idle for longer than ttl seconds.
+
+    Args:
+        manager: Pool manager to reap
+        ttl: Seconds a parked connection may stay open
+
+    Returns:
+        Number of connections closed
+    """
+    # Read the container directly, a lookup would reorder the LRU
+    with manager.pools.lock:
+        pools = list(manager.pools._container.values())
+
+    closed = sum(reap_idle_pool(pool, ttl) for pool in pools)
+    if closed:
+        log.debug("Closed %d idle connections", closed)
+    return closed
+
+
+def reap_idle_pool(pool: HTTPConnectionPool, ttl: float) -> int:
+    """
+    Close connections of one pool idle for longer than ttl seconds.
+
+    Args:
+        pool: Connection pool to reap
+        ttl: Seconds a parked connection may stay open
+
+    Returns:
+        Number of connections closed
+    """
+    if pool.pool is None:
+        return 0
+
+    expired_before = time.monotonic() - ttl
+    expired = []
+
+    # Swap in place under the queue's lock, requests never see it drained
+    with pool.pool.mutex:
+        parked = pool.pool.queue
+        for index, conn in enumerate(parked):
+            if (
+                conn is not None
+                and getattr(conn, "sock", None) is not None
+                and getattr(conn, _IDLE_SINCE, expired_before) < expired_before
+            ):
+                expired.append(conn)
+                parked[index] = None
+
+    for conn in expired:
+        conn.close()
+
+    return len(expired)
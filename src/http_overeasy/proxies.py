@@ -0,0 +1,89 @@
+"""Proxy configuration, explicit or from the HTTP(S)_PROXY/NO_PROXY environment."""
+from __future__ import annotations
+
+from typing import Any
+from urllib import parse
+from urllib import request
+
+import urllib3
+from http_overeasy.pools import POOL_CLASSES_BY_SCHEME
+
+PROXY_SCHEMES = ("http", "https")
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def resolve_proxies(
+    proxy: str | None = None,
+    no_proxy: str | None = None,
+    trust_env: bool = True,
+) -> dict[str, str]:
+    """
+    Proxy urls by scheme, plus hosts to bypass under the "no" key.
+
+    Explicit values win over the environment. Proxy urls without a scheme,
+    e.g. "proxy.corp:3128", are taken as "http://".
+
+    Args:
+        proxy: Proxy url for both http and https targets
+        no_proxy: Comma separated hosts/domains that are never proxied
+        trust_env: Read HTTP_PROXY, HTTPS_PROXY, and NO_PROXY from environment
+    """
+    proxies = request.getproxies_environment() if trust_env else {}
+    proxies = {
+        key: value for key, value in proxies.items() if key in (*PROXY_SCHEMES, "no")
+    }
+
+    if proxy:
+        proxies.update({scheme: proxy for scheme in PROXY_SCHEMES})
+    if no_proxy is not None:
+        proxies["no"] = no_proxy
+
+    for scheme in PROXY_SCHEMES:
+        if proxies.get(scheme) and "://" not in proxies[scheme]:
+            proxies[scheme] = f"http://{proxies[scheme]}"
+
+    return proxies
+
+
+def bypass_proxy(url: str, proxies: dict[str, str]) -> bool:
+    """True if url should be requested directly, without a proxy."""
+    split = parse.urlsplit(url)
+    hostname = (split.hostname or "").lower()
+    port = str(split.port or DEFAULT_PORTS.get(split.scheme.lower()))
+    if not proxies.get("no") or not hostname:
+        return False
+
+    for entry in proxies["no"].replace(" ", "").lower().split(","):
+        if entry == "*":
+            return True
+
+        host, _, entry_port = entry.lstrip("*").lstrip(".").partition(":")
+        if not host or (entry_port and entry_port != port):
+            continue
+        if hostname == host or hostname.endswith(f".{host}"):
+            return True
+
+    return False
+
+
+def proxy_manager(proxy_url: str, **pool_kwargs: Any) -> urllib3.ProxyManager:
+    """
+    Proxy pool manager keeping one pool, and CONNECT tunnel, per destination.
+
+    Credentials in the proxy url are sent as basic Proxy-Authorization.
+    """
+    parsed = urllib3.util.parse_url(proxy_url)
+    proxy_headers = None
+    if parsed.auth:
+        proxy_headers = urllib3.make_headers(
+            proxy_basic_auth=parse.unquote(parsed.auth)
+        )
+        proxy_url = parsed._replace(auth=None).url
+
+    manager = urllib3.ProxyManager(
+        proxy_url,
+        proxy_headers=proxy_headers,
+        **pool_kwargs,
+    )
+    manager.pool_classes_by_scheme = POOL_CLASSES_BY_SCHEME
+    return manager
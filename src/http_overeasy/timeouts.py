@@ -0,0 +1,163 @@
+"""Timeouts and deadlines that span connect, read, and retries."""
+from __future__ import annotations
+
+import time
+from typing import Any
+from typing import Tuple
+from typing import Union
+
+import urllib3
+from urllib3.connectionpool import ConnectionPool
+from urllib3.exceptions import ConnectTimeoutError
+from urllib3.exceptions import MaxRetryError
+from urllib3.exceptions import NewConnectionError
+from urllib3.exceptions import ReadTimeoutError
+
+TIMEOUT_CONNECT = 10.0
+TIMEOUT_READ = 30.0
+
+PHASE_CONNECT = "connect"
+PHASE_READ = "read"
+PHASE_DEADLINE = "deadline"
+
+# Never hand a socket a timeout of zero, that makes it non-blocking
+_MIN_TIMEOUT = 0.001
+
+TimeoutType = Union[float, Tuple[float, float]]
+
+
+class HTTPTimeoutError(MaxRetryError, urllib3.exceptions.TimeoutError):
+    def __init__(
+        self,
+        phase: str,
+        url: str,
+        reason: Exception | None = None,
+        pool: ConnectionPool | None = None,
+    ) -> None:
+        """
+        Raised when a request runs out of time.
+
+        Subclasses the urllib3 errors raised before, existing handlers of
+        MaxRetryError, TimeoutError, or HTTPError still catch it.
+
+        Args:
+            phase: One of "connect", "read", or "deadline"
+            url: URL of the request that timed out
+            reason: Underlying urllib3 error
+            pool: Connection pool the request was sent from
+        """
+        super().__init__(pool, url, reason)  # type: ignore[arg-type]
+        self.args = (f"{phase} timeout exceeded for url: {url}",)
+        self.phase = phase
+
+    def __reduce__(self) -> Any:
+        return type(self), (self.phase, self.url, self.reason)
+
+
+class DeadlineExceededError(MaxRetryError):
+    """Internal: Raised when retrying would run past the deadline."""
+
+
+class DeadlineTimeout(urllib3.Timeout):
+    def __init__(
+        self,
+        connect: float | None,
+        read: float | None,
+        expires: float,
+    ) -> None:
+        """
+        Connect and read timeouts clamped to the time left before `expires`.
+
+        Args:
+            connect: Seconds allowed to connect, per attempt
+            read: Seconds allowed between reads, per attempt
+            expires: `time.monotonic()` value when all attempts must be done
+        """
+        super().__init__(connect=connect, read=read)
+        self.expires = expires
+        self._limits = (connect, read)
+
+    def clone(self) -> DeadlineTimeout:
+        """Fresh copy for each attempt, the deadline is carried over."""
+        return DeadlineTimeout(*self._limits, self.expires)
+
+    @property
+    def connect_timeout(self) -> float:
+        """Connect timeout, shortened by time already spent."""
+        return self._clamp(super().connect_timeout)
+
+    @property
+    def read_timeout(self) -> float:
+        """Read timeout, shortened by time already spent."""
+        return self._clamp(super().read_timeout)
+
+    def _clamp(self, timeout: Any) -> float:
+        """Internal: Lesser of the timeout and the time remaining."""
+        remaining = max(self.expires - time.monotonic(), _MIN_TIMEOUT)
+        if timeout is None or timeout is self.DEFAULT_TIMEOUT:
+            return remaining
+        return min(timeout, remaining)
+
+
+class DeadlineRetry(urllib3.Retry):
+    def __init__(self, *args: Any, expires: float | None = None, **kwargs: Any) -> None:
+        """
+        Retry policy that gives up when the next attempt can't start in time.
+
+        Args:
+            expires: `time.monotonic()` value when all attempts must be done
+        """
+        super().__init__(*args, **kwargs)
+        self.expires = expires
+
+    def new(self, **kw: Any) -> DeadlineRetry:
+        """Copy of the retry, the deadline is carried over."""
+        kw.setdefault("expires", self.expires)
+        return super().new(**kw)
+
+    def increment(
+        self,
+        method: str | None = None,
+        url: str | None = None,
+        response: Any = None,
+        error: Exception | None = None,
+        _pool: Any = None,
+        _stacktrace: Any = None,
+    ) -> DeadlineRetry:
+        """Count the attempt, raise if the backoff would outlast the deadline."""
+        retry = super().increment(method, url, response, error, _pool, _stacktrace)
+        if self.expires is None:
+            return retry
+
+        wait = retry.get_backoff_time()
+        if response is not None and retry.respect_retry_after_header:
+            wait = retry.get_retry_after(response) or wait
+
+        if time.monotonic() + wait >= self.expires:
+            raise DeadlineExceededError(_pool, url, error)
+
+        return retry
+
+
+def split_timeout(timeout: TimeoutType | None) -> tuple[float | None, float | None]:
+    """Split a timeout into (connect, read) seconds."""
+    if isinstance(timeout, tuple):
+        return timeout
+    return timeout, timeout
+
+
+def timeout_phase(error: Exception) -> str | None:
+    """Phase of the request that ran out of time, None if not a timeout."""
+    if isinstance(error, DeadlineExceededError):
+        return PHASE_DEADLINE
+
+    if isinstance(error, MaxRetryError) and error.reason is not None:
+        error = error.reason
+
+    if isinstance(error, NewConnectionError):
+        return None
+    if isinstance(error, ConnectTimeoutError):
+        return PHASE_CONNECT
+    if isinstance(error, ReadTimeoutError):
+        return PHASE_READ
+    return None
@@ -0,0 +1,185 @@
+"""Shared SSLContext that resumes TLS sessions and counts handshakes."""
+from __future__ import annotations
+
+import os
+import socket
+import ssl
+import threading
+import time
+import weakref
+from typing import Any
+from typing import NamedTuple
+from typing import Tuple
+
+_SessionKey = Tuple[str, int]
+
+
+class TLSStats(NamedTuple):
+    handshakes: int
+    resumed: int
+    seconds: float
+
+    @property
+    def average_seconds(self) -> float:
+        """Average seconds per handshake."""
+        return self.seconds / self.handshakes if self.handshakes else 0.0
+
+
+class SessionSavingSocket(ssl.SSLSocket):
+    """SSLSocket that hands its session back to the context when closed."""
+
+    def close(self) -> None:
+        # TLS 1.3 tickets arrive after the handshake, the session is best now
+        if isinstance(self.context, SessionCachingContext) and self._handshaken():
+            self.context._save_session(self)
+        super().close()
+
+    def _handshaken(self) -> bool:
+        """Internal: True once the client handshake completed."""
+        try:
+            return not self.server_side and self.version() is not None
+        except (ValueError, OSError):
+            return False
+
+
+class SessionCachingContext(ssl.SSLContext):
+    """SSLContext, shared by all pools, that resumes sessions per host."""
+
+    sslsocket_class = SessionSavingSocket
+
+    def __new__(cls, *args: Any, **kwargs: Any) -> SessionCachingContext:
+        context = super().__new__(cls, *args, **kwargs)
+        context._stats_lock = threading.Lock()
+        context._sessions = {}
+        context._sockets = {}
+        context._handshakes = 0
+        context._resumed = 0
+        context._seconds = 0.0
+        return context
+
+    # Set in __new__, declared for type checkers
+    _stats_lock: threading.Lock
+    _sessions: dict[_SessionKey, ssl.SSLSession]
+    _sockets: dict[_SessionKey, weakref.ref[ssl.SSLSocket]]
+    _handshakes: int
+    _resumed: int
+    _seconds: float
+
+    @property
+    def stats(self) -> TLSStats:
+        """Handshakes made, how many were resumed, and total seconds spent."""
+        with self._stats_lock:
+            return TLSStats(self._handshakes, self._resumed, self._seconds)
+
+    def _reset_after_fork(self) -> None:
+        """Internal: New lock in a forked child, the parent's may be held."""
+        self._stats_lock = threading.Lock()
+        # Sockets are the parent's, its sessions can still be resumed
+        self._sockets = {}
+
+    def wrap_socket(
+        self,
+        sock: socket.socket,
+        server_side: bool = False,
+        do_handshake_on_connect: bool = True,
+        suppress_ragged_eofs: bool = True,
+        server_hostname: str | bytes | None = None,
+        session: ssl.SSLSession | None = None,
+    ) -> ssl.SSLSocket:
+        """Wrap socket, resuming the last session to the same host and port."""
+        key = self._session_key(sock, server_hostname)
+        if session is None and key is not None and not server_side:
+            session = self._session_for(key)
+
+        started = time.perf_counter()
+        ssl_sock = super().wrap_socket(
+            sock,
+            server_side=server_side,
+            do_handshake_on_connect=do_handshake_on_connect,
+            suppress_ragged_eofs=suppress_ragged_eofs,
+            server_hostname=server_hostname,
+            session=session,
+        )
+        elapsed = time.perf_counter() - started
+
+        if do_handshake_on_connect and not server_side:
+            with self._stats_lock:
+                self._handshakes += 1
+                self._resumed += ssl_sock.session_reused is True
+                self._seconds += elapsed
+            self._save_session(ssl_sock)
+
+        return ssl_sock
+
+    def _save_session(self, ssl_sock: ssl.SSLSocket) -> None:
+        """Internal: Keep the socket's session for the next connection."""
+        if ssl_sock.server_side:
+            return
+
+        key = self._session_key(ssl_sock, ssl_sock.server_hostname)
+        if key is None:
+            return
+        try:
+            session = ssl_sock.session
+        except (ValueError, OSError):
+            # Nothing resumable, e.g. the handshake never finished
+            session = None
+
+        with self._stats_lock:
+            self._sockets[key] = weakref.ref(ssl_sock)
+            if session is not None:
+                self._sessions[key] = session
+
+    def _session_for(self, key: _SessionKey) -> ssl.SSLSession | None:
+        """Internal: Freshest resumable session for host and port, if any."""
+        with self._stats_lock:
+            ref = self._sockets.get(key)
+            live = ref() if ref is not None else None
+            # An open connection to the same host may have received a new ticket
+            if live is not None and live.session is not None:
+                self._sessions[key] = live.session
+
+            session = self._sessions.get(key)
+
+        if session is not None and (session.has_ticket or session.id):
+            return session
+        return None
+
+    @staticmethod
+    def _session_key(
+        sock: socket.socket,
+        server_hostname: str | bytes | None,
+    ) -> _SessionKey | None:
+        """Internal: (host, port) the socket is connected to."""
+        if server_hostname is None:
+            return None
+        if isinstance(server_hostname, bytes):
+            server_hostname = server_hostname.decode()
+        try:
+            return server_hostname, sock.getpeername()[1]
+        except (OSError, IndexError, TypeError):
+            return None
+
+
+def build_ssl_context(ca_bundle: str | None = None) -> SessionCachingContext:
+    """
+    Client SSLContext built once, with the CA bundle loaded once.
+
+    Args:
+        ca_bundle: Path to a CA bundle file, or directory, used over the
+            system default certificates
+    """
+    context = SessionCachingContext(ssl.PROTOCOL_TLS_CLIENT)
+    context.minimum_version = ssl.TLSVersion.TLSv1_2
+    context.hostname_checks_common_name = False
+    if hasattr(context, "post_handshake_auth"):
+        context.post_handshake_auth = True
+
+    if ca_bundle is None:
+        context.load_default_certs()
+    elif os.path.isdir(ca_bundle):
+        context.load_verify_locations(capath=ca_bundle)
+    else:
+        context.load_verify_locations(cafile=ca_bundle)
+
+    return context
@@ -0,0 +1,92 @@
+"""Pooled keep-alive HTTP over Unix domain sockets, for local sidecars."""
+from __future__ import annotations
+
+import socket
+from typing import Any
+from typing import NamedTuple
+from urllib import parse
+
+from http_overeasy.pools import IdleTrackingHTTPConnectionPool
+from urllib3.connection import HTTPConnection
+from urllib3.exceptions import ConnectTimeoutError
+from urllib3.exceptions import NewConnectionError
+
+UNIX_SCHEME = "http+unix"
+UNIX_HOST = "localhost"
+
+
+class UnixTarget(NamedTuple):
+    socket_path: str
+    host: str
+    path: str
+
+
+class UnixHTTPConnection(HTTPConnection):
+    def __init__(self, *args: Any, socket_path: str, **kwargs: Any) -> None:
+        """HTTP connection made over the Unix domain socket at socket_path."""
+        super().__init__(*args, **kwargs)
+        self.socket_path = socket_path
+
+    def _new_conn(self) -> socket.socket:
+        """Connect to the socket path in place of host and port."""
+        if not hasattr(socket, "AF_UNIX"):  # pragma: no cover
+            raise NewConnectionError(self, "Unix domain sockets are not supported")
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is None or isinstance(self.timeout, (int, float)):
+            sock.settimeout(self.timeout)
+
+        try:
+            sock.connect(self.socket_path)
+        except socket.timeout as err:
+            sock.close()
+            raise ConnectTimeoutError(
+                self,
+                f"Connection to {self.socket_path} timed out. "
+                f"(connect timeout={self.timeout})",
+            ) from err
+        except OSError as err:
+            sock.close()
+            raise NewConnectionError(
+                self, f"Failed to establish a new connection: {err}"
+            ) from err
+
+        return sock
+
+
+class UnixHTTPConnectionPool(IdleTrackingHTTPConnectionPool):
+    """Keep-alive pool of connections to one Unix domain socket."""
+
+    ConnectionCls = UnixHTTPConnection
+
+    def __init__(self, host: str, socket_path: str, **kwargs: Any) -> None:
+        super().__init__(host, socket_path=socket_path, **kwargs)
+        self.socket_path = socket_path
+
+    def __str__(self) -> str:
+        return f"{type(self).__name__}(socket_path={self.socket_path})"
+
+
+def unix_target(url: str, unix_sockets: dict[str, str]) -> UnixTarget | None:
+    """
+    Unix domain socket, Host header, and request path of url if it has one.
+
+    Args:
+        url: "http+unix://<url quoted socket path>/path", or an "http" url
+            whose host is mapped to a socket path
+        unix_sockets: {host: socket path} mapping
+    """
+    split = parse.urlsplit(url)
+    scheme = split.scheme.lower()
+
+    if scheme == UNIX_SCHEME:
+        socket_path = parse.unquote(split.netloc)
+        host = UNIX_HOST
+    elif scheme == "http" and split.hostname in unix_sockets:
+        socket_path = unix_sockets[split.hostname]
+        host = split.hostname
+    else:
+        return None
+
+    path = parse.urlunsplit(("", "", split.path or "/", split.query, ""))
+    return UnixTarget(socket_path, host, path)
@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import pytest
+from http_overeasy import __main__ as cli
+from http_overeasy.bench import Bench
+from http_overeasy.bench import BenchReport
+from http_overeasy.bench import RequestTemplate
+from http_overeasy.bench import Sample
+from http_overeasy.http_client import HTTPClient
+
+
+@pytest.fixture
+def client() -> HTTPClient:
+    return HTTPClient(trust_env=False, pool_size=4)
+
+
+def test_template_from_dict_json() -> None:
+    template = RequestTemplate.from_dict(
+        {"method": "post", "url": "http://x/", "json": {"a": 1}}
+    )
+
+    assert template.method == "POST"
+    assert template.body == {"a": 1}
+    assert template.headers == {"content-type": "application/json"}
+
+
+def test_template_from_dict_data_keeps_headers() -> None:
+    template = RequestTemplate.from_dict(
+        {"url": "http://x/", "data": {"a": 1}, "headers": {"x-id": "1"}}
+    )
+
+    assert template.method == "GET"
+    assert template.headers == {
+        "content-type": "application/x-www-form-urlencoded",
+        "x-id": "1",
+    }
+
+
+def test_template_from_dict_rejects_both_bodies() -> None:
+    with pytest.raises(ValueError):
+        RequestTemplate.from_dict({"url": "http://x/", "json": {}, "data": {}})
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    ({"workers": 0}, {"rate": 0}),
+)
+def test_bench_rejects_bad_arguments(client: HTTPClient, kwargs: Any) -> None:
+    with pytest.raises(ValueError):
+        Bench(client, [RequestTemplate("GET", "http://x/")], **kwargs)
+
+    with pytest.raises(ValueError):
+        Bench(client, [])
+
+
+def test_closed_loop(client: HTTPClient, local_server: str) -> None:
+    templates = [
+        RequestTemplate("GET", f"{local_server}/"),
+        RequestTemplate("GET", f"{local_server}/status/404"),
+    ]
+    report = Bench(client, templates, workers=2, duration=0.3).run()
+
+    assert report.mode == "closed-loop"
+    assert report.requests > 2
+    assert set(report.status_codes) == {"200", "404"}
+    assert report.errors == {"HTTP 404": report.status_codes["404"]}
+    assert sum(report.histogram().values()) == report.requests
+
+
+def test_open_loop_holds_rate(client: HTTPClient, local_server: str) -> None:
+    templates = [RequestTemplate("GET", f"{local_server}/")]
+    report = Bench(client, templates, workers=2, duration=0.5, rate=40).run()
+
+    assert report.mode == "open-loop"
+    assert 15 <= report.requests <= 21
+    assert report.status_codes == {"200": report.requests}
+
+
+def test_open_loop_counts_queueing(client: HTTPClient) -> None:
+    templates = [RequestTemplate("GET", "http://127.0.0.1:9/")]
+
+    def _slow(*args: Any) -> MagicMock:
+        time.sleep(0.1)
+        return MagicMock(status_code=200)
+
+    with patch.object(client, "_request_handler", _slow):
+        report = Bench(client, templates, workers=1, duration=0.35, rate=20).run()
+
+    # Later requests wait on the one worker, their latency includes that wait
+    assert report.requests >= 3
+    assert report.percentiles()["max"] >= 150
+    assert report.dropped >= 1
+
+
+def test_open_loop_overload(client: HTTPClient, local_server: str) -> None:
+    templates = [RequestTemplate("GET", f"{local_server}/slow")]
+    started = time.monotonic()
+    report = Bench(client, templates, workers=1, duration=1.0, rate=5).run()
+
+    # Only one request fits the period, the backlog is dropped, not sent late
+    assert time.monotonic() - started < 1.5
+    assert report.requests == 1
+    assert report.dropped == 4
+    assert report.throughput <= 1.0
+
+
+def test_warmup_is_not_measured(client: HTTPClient, local_server: str) -> None:
+    templates = [RequestTemplate("GET", f"{local_server}/")]
+    bench = Bench(client, templates, duration=0.1, warmup=0.2, rate=50)
+    report = bench.run()
+
+    assert 4 <= report.requests <= 6
+
+
+def test_bodies_use_client_encoding(local_server: str) -> None:
+    templates = [
+        RequestTemplate.from_dict(
+            {"method": "POST", "url": f"{local_server}/", "json": {"a": 1}}
+        ),
+        RequestTemplate.from_dict(
+            {"method": "POST", "url": f"{local_server}/", "data": {"a": [1, 2]}}
+        ),
+    ]
+    client = HTTPClient(trust_env=False)
+    sent = []
+    real = client._send
+
+    def _send(request_kwargs: dict[str, Any], **kw: Any) -> Any:
+        sent.append(request_kwargs["body"])
+        return real(request_kwargs, **kw)
+
+    with patch.object(client, "_send", _send):
+        Bench(client, templates, duration=0.1, rate=20).run()
+
+    assert sent[:2] == ['{"a": 1}', "a=1&a=2"]
+
+
+def test_errors_are_counted_by_type(client: HTTPClient) -> None:
+    templates = [RequestTemplate("GET", "http://127.0.0.1:9/")]
+
+    with patch.object(client, "_send", side_effect=ConnectionResetError):
+        report = Bench(client, templates, duration=0.1, rate=20).run()
+
+    assert report.status_codes == {}
+    assert report.errors == {"ConnectionResetError": report.requests}
+
+
+def test_report_percentiles_and_histogram() -> None:
+    samples = [Sample(0.0, ms / 1000, 200, None) for ms in range(1, 101)]
+    report = BenchReport(
+        samples, duration=2.0, mode="closed-loop", workers=1, rate=None
+    )
+
+    assert report.throughput == 50.0
+    assert report.percentiles() == {
+        "p50": 50.0,
+        "p90": 90.0,
+        "p95": 95.0,
+        "p99": 99.0,
+        "p99.9": 100.0,
+        "max": 100.0,
+    }
+    histogram = report.histogram()
+    assert histogram["<=1ms"] == 1
+    assert histogram["<=100ms"] == 50
+    assert histogram[">10000ms"] == 0
+
+
+def test_report_text_and_json() -> None:
+    samples = [Sample(0.0, 0.003, 200, None), Sample(0.0, 0.5, None, "Boom")]
+    report = BenchReport(samples, duration=1.0, mode="open-loop", workers=2, rate=5)
+
+    text = report.to_text()
+    loaded = json.loads(report.to_json())
+
+    assert "open-loop (2 workers, target 5 req/s)" in text
+    assert "Boom: 1" in text
+    assert loaded["requests"] == 2
+    assert loaded["dropped"] == 0
+    assert loaded["errors"] == {"Boom": 1}
+    assert loaded["latency_ms"]["max"] == 500.0
+
+
+def test_cli_bench_json(
+    local_server: str,
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("NO_PROXY", "*")
+    argv = [
+        "bench",
+        f"{local_server}/",
+        "-X",
+        "POST",
+        "--data",
+        "a=1&b=2",
+        "-H",
+        "X-Id: 1",
+        "--rate",
+        "20",
+        "--duration",
+        "0.2",
+        "--format",
+        "json",
+    ]
+
+    assert cli.main(argv) == 0
+    report = json.loads(capsys.readouterr().out)
+
+    assert report["mode"] == "open-loop"
+    assert report["status_codes"] == {"200": report["requests"]}
+
+
+def test_cli_bench_templates_text(
+    local_server: str,
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("NO_PROXY", "*")
+    templates = tmp_path / "templates.json"
+    templates.write_text(json.dumps([{"url": f"{local_server}/status/201"}]))
+
+    assert cli.main(["bench", "--templates", str(templates), "-d", "0.2"]) == 0
+    output = capsys.readouterr().out
+
+    assert "closed-loop (1 workers)" in output
+    assert "201:" in output
+
+
+@pytest.mark.parametrize(
+    "argv",
+    (
+        ["bench"],
+        ["bench", "http://x/", "-H", "no-colon"],
+        ["bench", "http://x/", "--json", "{not json"],
+        ["bench", "--templates", "/does/not/exist.json"],
+    ),
+)
+def test_cli_bench_bad_arguments(argv: list[str]) -> None:
+    with pytest.raises(SystemExit):
+        cli.main(argv)
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import os
+import select
+import shutil
+import socket
+import socketserver
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Generator
+
+import pytest
+
+
+class LocalHandler(BaseHTTPRequestHandler):
+    """Keep-alive handler; /slow takes a second, /status/<code> sets status."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes, avoid delayed ACK stalls
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        self._respond()
+
+    def do_POST(self) -> None:
+        self._respond()
+
+    def _respond(self) -> None:
+        length = int(self.headers.get("content-length") or 0)
+        body = self.rfile.read(length) if length else b"ok"
+
+        if self.path.startswith("/slow"):
+            time.sleep(1)
+
+        status = 200
+        if self.path.startswith("/status/"):
+            status = int(self.path.split("/")[2])
+
+        self.send_response(status)
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def serve_local() -> Generator[Callable[..., str], None, None]:
+    """Start local servers, optionally TLS wrapped, returns the base url."""
+    servers: list[ThreadingHTTPServer] = []
+
+    def serve(context: ssl.SSLContext | None = None) -> str:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), LocalHandler)
+        server.daemon_threads = True
+        if context is not None:
+            server.socket = context.wrap_socket(server.socket, server_side=True)
+        thread = threading.Thread(
+            target=server.serve_forever,
+            args=(0.01,),
+            daemon=True,
+        )
+        thread.start()
+        servers.append(server)
+
+        scheme = "https" if context is not None else "http"
+        host = "localhost" if context is not None else "127.0.0.1"
+        return f"{scheme}://{host}:{server.server_address[1]}"
+
+    yield serve
+
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def local_server(serve_local: Callable[..., str]) -> str:
+    """Local HTTP server, returns the base url."""
+    return serve_local()
+
+
+@pytest.fixture
+def cert_file(tmp_path: Path) -> str:
+    """Self-signed certificate for localhost, key in a neighbouring file."""
+    if shutil.which("openssl") is None:
+        pytest.skip("requires openssl")
+
+    subprocess.run(
+        [
+            "openssl",
+            "req",
+            "-x509",
+            "-newkey",
+            "rsa:2048",
+            "-nodes",
+            "-days",
+            "1",
+            "-subj",
+            "/CN=localhost",
+            "-addext",
+            "subjectAltName=DNS:localhost",
+            "-keyout",
+            str(tmp_path / "key.pem"),
+            "-out",
+            str(tmp_path / "cert.pem"),
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return str(tmp_path / "cert.pem")
+
+
+class ConnectProxyHandler(socketserver.BaseRequestHandler):
+    """Tunnels CONNECT requests, counting each tunnel opened."""
+
+    def handle(self) -> None:
+        request = b""
+        while b"\r\n\r\n" not in request:
+            chunk = self.request.recv(4096)
+            if not chunk:
+                return
+            request += chunk
+
+        method, target, _ = request.split(b"\r\n", 1)[0].split(b" ", 2)
+        if method != b"CONNECT":
+            self.request.sendall(b"HTTP/1.1 405 Method Not Allowed\r\n\r\n")
+            return
+
+        host, _, port = target.decode().rpartition(":")
+        with socket.create_connection((host, int(port))) as upstream:
+            self.server.tunnels += 1  # type: ignore
+            self.request.sendall(b"HTTP/1.1 200 Connection established\r\n\r\n")
+            self._pipe(self.request, upstream)
+
+    @staticmethod
+    def _pipe(client: socket.socket, upstream: socket.socket) -> None:
+        sockets = [client, upstream]
+        while True:
+            readable, _, _ = select.select(sockets, [], [], 5)
+            if not readable:
+                return
+            for sock in readable:
+                data = sock.recv(65536)
+                if not data:
+                    return
+                (upstream if sock is client else client).sendall(data)
+
+
+class ConnectProxy(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    tunnels = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+@pytest.fixture
+def connect_proxy() -> Generator[ConnectProxy, None, None]:
+    """Local HTTP CONNECT proxy, tunnels opened are counted in .tunnels"""
+    proxy = ConnectProxy(("127.0.0.1", 0), ConnectProxyHandler)
+    thread = threading.Thread(target=proxy.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    yield proxy
+    proxy.shutdown()
+    proxy.server_close()
+
+
+@pytest.fixture
+def unix_server() -> Generator[str, None, None]:
+    """Local HTTP server on a Unix domain socket, yields the socket path."""
+    if not hasattr(socket, "AF_UNIX"):
+        pytest.skip("requires Unix domain sockets")
+
+    class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    class UnixHandler(LocalHandler):
+        disable_nagle_algorithm = False
+
+    # Socket paths are limited to ~100 characters, keep it short
+    directory = tempfile.mkdtemp()
+    socket_path = os.path.join(directory, "http.sock")
+    server = UnixHTTPServer(socket_path, UnixHandler)
+    thread = threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    yield socket_path
+    server.shutdown()
+    server.server_close()
+    shutil.rmtree(directory)
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import pytest
+from http_overeasy.hedging import HedgePolicy
+
+HOST = "example.com"
+
+
+def test_fixed_delay_ignores_samples() -> None:
+    policy = HedgePolicy(delay=0.5, min_samples=1)
+    policy.record(HOST, 10.0)
+
+    assert policy.delay_for(HOST) == 0.5
+
+
+def test_percentile_delay_falls_back_until_min_samples() -> None:
+    policy = HedgePolicy(delay=0.5, percentile=95, min_samples=5)
+    for _ in range(4):
+        policy.record(HOST, 0.01)
+
+    assert policy.delay_for(HOST) == 0.5
+    assert policy.delay_for("other.com") == 0.5
+
+
+def test_percentile_delay_per_host() -> None:
+    policy = HedgePolicy(percentile=95, min_samples=20)
+    for sample in range(1, 101):
+        policy.record(HOST, sample / 100)
+        policy.record("other.com", 1.0)
+
+    assert policy.delay_for(HOST) == 0.95
+    assert policy.delay_for("other.com") == 1.0
+
+
+def test_samples_are_bounded() -> None:
+    policy = HedgePolicy(percentile=50, min_samples=1, sample_size=2)
+    for sample in (9.0, 9.0, 1.0, 1.0):
+        policy.record(HOST, sample)
+
+    assert policy.delay_for(HOST) == 1.0
+
+
+def test_hedge_rate_is_capped() -> None:
+    policy = HedgePolicy(max_ratio=0.5, burst=1)
+
+    assert policy.try_acquire() is True
+    assert policy.try_acquire() is False
+
+    policy.request_started()
+    assert policy.try_acquire() is False
+
+    policy.request_started()
+    assert policy.try_acquire() is True
+    assert policy.hedged == 2
+
+
+def test_burst_caps_saved_hedges() -> None:
+    policy = HedgePolicy(max_ratio=1, burst=2)
+    for _ in range(10):
+        policy.request_started()
+
+    assert [policy.try_acquire() for _ in range(3)] == [True, True, False]
+
+
+@pytest.mark.parametrize("percentile", (0, -1, 101))
+def test_invalid_percentile(percentile: float) -> None:
+    with pytest.raises(ValueError):
+        HedgePolicy(percentile=percentile)
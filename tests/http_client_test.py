@@ -1,19 +1,39 @@
 from __future__ import annotations
 
 import json
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import Future
 from typing import Any
 from typing import Dict
 from typing import Generator
 from typing import Optional
 from typing import Tuple
+from typing import Type
 from unittest.mock import MagicMock
 from unittest.mock import patch
 from urllib import parse
 
 import pytest
+import urllib3
 from http_overeasy import http_client as http_client
+from http_overeasy.hedging import HedgePolicy
 from http_overeasy.http_client import HTTPClient
 from http_overeasy.response import Response
+from http_overeasy.timeouts import DeadlineRetry
+from http_overeasy.timeouts import DeadlineTimeout
+from http_overeasy.timeouts import HTTPTimeoutError
+from http_overeasy.timeouts import PHASE_CONNECT
+from http_overeasy.timeouts import PHASE_DEADLINE
+from http_overeasy.timeouts import PHASE_READ
+from http_overeasy.timeouts import TIMEOUT_CONNECT
+from http_overeasy.timeouts import TIMEOUT_READ
+from http_overeasy.tls import SessionCachingContext
+from urllib3.exceptions import ConnectTimeoutError
+from urllib3.exceptions import MaxRetryError
+from urllib3.exceptions import ReadTimeoutError
 from urllib3.response import HTTPResponse
 
 MAX_POOLS = 2
@@ -210,3 +230,354 @@ def test_format_headers(headers: dict[str, str], expected: dict[str, str]) -> No
     result = HTTPClient._format_headers(headers)
 
     assert result == expected
+
+
+@pytest.fixture
+def hedge_client() -> Generator[Tuple[HTTPClient, MagicMock], None, None]:
+    """Client where the first request sent hangs until released."""
+    client = HTTPClient(hedge=HedgePolicy(delay=0.01))
+    release = threading.Event()
+    responses = [MagicMock(data=b"slow"), MagicMock(data=b"fast")]
+
+    def request(**kwargs: Any) -> MagicMock:
+        resp = responses.pop(0)
+        if resp.data == b"slow":
+            release.wait(timeout=5)
+        return resp
+
+    mock_request = MagicMock(side_effect=request)
+    with patch.object(client, "http", new=MagicMock(request=mock_request)):
+        yield client, mock_request
+        release.set()
+
+
+def test_hedged_request_fast_response_wins(
+    hedge_client: Tuple[HTTPClient, MagicMock],
+) -> None:
+    client, mock_request = hedge_client
+
+    result = client.get("https://example.com")
+
+    assert result.text == "fast"
+    assert mock_request.call_count == 2
+    assert client.hedge is not None and client.hedge.hedged == 1
+
+
+def test_hedged_request_not_sent_when_rate_capped() -> None:
+    client = HTTPClient(hedge=HedgePolicy(delay=0.01, burst=0))
+
+    def slow_send(request_kwargs: Dict[str, Any]) -> HTTPResponse:
+        time.sleep(0.05)
+        return HTTPResponse(body=b"primary", status=200)
+
+    with patch.object(client, "_send_unloaded", side_effect=slow_send) as send:
+        result = client.get("https://example.com")
+
+    assert result.text == "primary"
+    assert send.call_count == 1
+    assert client.hedge is not None and client.hedge.hedged == 0
+
+
+def test_hedging_does_not_limit_concurrent_requests() -> None:
+    client = HTTPClient(hedge=HedgePolicy(delay=5, max_workers=1))
+
+    def slow_send(request_kwargs: Dict[str, Any]) -> HTTPResponse:
+        time.sleep(0.2)
+        return HTTPResponse(body=b"primary", status=200)
+
+    with patch.object(client, "_send_unloaded", side_effect=slow_send):
+        threads = [
+            threading.Thread(target=client.get, args=("https://example.com",))
+            for _ in range(4)
+        ]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+
+    # Four callers, one hedge worker: primaries still run side by side
+    assert elapsed < 0.4
+    assert client.hedge is not None
+    samples = client.hedge._samples["example.com"]
+    assert len(samples) == 4
+    assert all(0.2 <= sample < 0.3 for sample in samples)
+
+
+@pytest.mark.parametrize("method", ("post", "put", "patch", "delete"))
+def test_hedging_skips_methods_not_allowed(
+    method: str,
+    hedge_client: Tuple[HTTPClient, MagicMock],
+) -> None:
+    client, _ = hedge_client
+
+    with patch.object(client, "_hedged_request") as hedged:
+        with patch.object(client.http, "request", return_value=HTTPResponse()):
+            getattr(client, method)("https://example.com")
+
+    hedged.assert_not_called()
+
+
+def test_hedge_loser_is_discarded() -> None:
+    resp = MagicMock()
+    future: Future[Any] = Future()
+    future.set_result(resp)
+
+    HTTPClient._discard_response(future)
+
+    resp.close.assert_called_once()
+    resp.release_conn.assert_called_once()
+
+
+def test_default_timeout(base_client: HTTPClient) -> None:
+    timeout = base_client.http.connection_pool_kw["timeout"]
+
+    assert timeout.connect_timeout == TIMEOUT_CONNECT
+    assert timeout.read_timeout == TIMEOUT_READ
+
+
+def test_per_call_timeout(patch_client: HTTPClient) -> None:
+    patch_client.get("https://example.com", timeout=(1.0, 2.0))
+
+    kwargs = patch_client.http.request.call_args[1]
+    assert kwargs["timeout"].connect_timeout == 1.0
+    assert kwargs["timeout"].read_timeout == 2.0
+    assert "retries" not in kwargs
+
+
+def test_deadline_binds_timeout_and_retries(patch_client: HTTPClient) -> None:
+    patch_client.deadline = 5.0
+
+    patch_client.post("https://example.com", timeout=1.0)
+
+    kwargs = patch_client.http.request.call_args[1]
+    assert isinstance(kwargs["timeout"], DeadlineTimeout)
+    assert isinstance(kwargs["retries"], DeadlineRetry)
+    assert kwargs["timeout"].expires == kwargs["retries"].expires
+    assert kwargs["timeout"].connect_timeout == 1.0
+
+
+@pytest.mark.parametrize(
+    ("error", "phase"),
+    (
+        (MaxRetryError(None, "/", ConnectTimeoutError()), PHASE_CONNECT),
+        (ReadTimeoutError(None, "/", "timed out"), PHASE_READ),
+    ),
+)
+def test_timeout_error_reports_phase(
+    error: Exception,
+    phase: str,
+    patch_client: HTTPClient,
+) -> None:
+    patch_client.http.request.side_effect = error
+
+    with pytest.raises(HTTPTimeoutError) as err:
+        patch_client.get("https://example.com")
+
+    assert err.value.phase == phase
+    assert err.value.url == "https://example.com"
+
+
+@pytest.mark.parametrize(
+    "handled",
+    (MaxRetryError, urllib3.exceptions.TimeoutError, urllib3.exceptions.HTTPError),
+)
+def test_timeout_error_caught_by_urllib3_handlers(
+    handled: Type[Exception],
+    patch_client: HTTPClient,
+) -> None:
+    reason = ConnectTimeoutError()
+    patch_client.http.request.side_effect = MaxRetryError(None, "/", reason)
+
+    with pytest.raises(handled) as err:
+        patch_client.get("https://example.com")
+
+    assert isinstance(err.value, HTTPTimeoutError)
+    assert err.value.reason is reason
+    assert str(err.value) == "connect timeout exceeded for url: https://example.com"
+
+    copied = pickle.loads(pickle.dumps(err.value))
+    assert (copied.phase, copied.url) == (PHASE_CONNECT, "https://example.com")
+
+
+def test_other_errors_are_not_timeouts(patch_client: HTTPClient) -> None:
+    patch_client.http.request.side_effect = MaxRetryError(None, "/", None)
+
+    with pytest.raises(MaxRetryError):
+        patch_client.get("https://example.com")
+
+
+def test_deadline_covers_retries(local_server: str) -> None:
+    client = HTTPClient(timeout=0.1, deadline=0.5)
+    started = time.monotonic()
+
+    with pytest.raises(HTTPTimeoutError) as err:
+        client.get(f"{local_server}/slow")
+
+    assert err.value.phase == PHASE_DEADLINE
+    assert time.monotonic() - started < 1
+
+
+def test_check_fork_same_process_keeps_pools(base_client: HTTPClient) -> None:
+    http = base_client.http
+
+    base_client._check_fork()
+
+    assert base_client.http is http
+
+
+def test_check_fork_rebuilds_pools_in_child() -> None:
+    after_fork = MagicMock()
+    client = HTTPClient(max_pool=MAX_POOLS, after_fork=after_fork)
+    client._hedge_executor = MagicMock()
+    http = client.http
+
+    with patch.object(http_client.os, "getpid", return_value=client._pid + 1):
+        client._check_fork()
+        client._check_fork()
+
+    assert client.http is not http
+    assert client.http.pools._maxsize == MAX_POOLS
+    assert client._hedge_executor is None
+    after_fork.assert_called_once_with(client)
+
+
+def test_check_fork_replaces_locks_held_in_parent() -> None:
+    client = HTTPClient(hedge=HedgePolicy())
+    assert client.hedge is not None
+    assert isinstance(client.ssl_context, SessionCachingContext)
+    # Held by parent threads at the moment of fork
+    client.hedge._lock.acquire()
+    client.ssl_context._stats_lock.acquire()
+
+    with patch.object(http_client.os, "getpid", return_value=client._pid + 1):
+        client._check_fork()
+
+    assert not client.hedge._lock.locked()
+    assert not client.ssl_context._stats_lock.locked()
+    assert client.tls_stats is not None
+
+
+def test_fork_hook_defers_after_fork_to_first_request() -> None:
+    after_fork = MagicMock()
+    client = HTTPClient(after_fork=after_fork)
+    http = client.http
+
+    with patch.object(http_client.os, "getpid", return_value=client._pid + 1):
+        http_client._after_fork_in_child()
+
+        assert client.http is not http
+        after_fork.assert_not_called()
+
+        client._check_fork()
+        client._check_fork()
+
+    after_fork.assert_called_once_with(client)
+
+
+def test_check_fork_callback_errors_are_logged(caplog: Any) -> None:
+    client = HTTPClient(after_fork=MagicMock(side_effect=ValueError))
+
+    with patch.object(http_client.os, "getpid", return_value=client._pid + 1):
+        client._check_fork()
+
+    assert "after_fork callback failed" in caplog.text
+
+
+def test_request_checks_for_fork(patch_client: HTTPClient) -> None:
+    with patch.object(patch_client, "_check_fork") as check_fork:
+        patch_client.get("https://example.com")
+
+    check_fork.assert_called_once()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_pools_rebuilt_on_fork() -> None:
+    client = HTTPClient()
+    parent_http = id(client.http)
+
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover
+        rebuilt = id(client.http) != parent_http and client._pid == os.getpid()
+        os._exit(0 if rebuilt else 1)
+
+    _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 0
+
+
+def test_warm(local_server: str) -> None:
+    client = HTTPClient(pool_size=2)
+
+    result = client.warm([local_server, "http://127.0.0.1:1"], connections_per_host=2)
+
+    assert result == 2
+    assert client.get(local_server).text == "ok"
+    client.close()
+
+
+def test_idle_reaper_closes_connections(local_server: str) -> None:
+    client = HTTPClient(pool_size=2, idle_ttl=0.05)
+    client.warm([local_server], connections_per_host=2)
+    pool = client.http.connection_from_url(local_server)
+
+    time.sleep(0.2)
+
+    assert pool.pool is not None
+    assert all(conn is None or conn.sock is None for conn in list(pool.pool.queue))
+    client.close()
+
+
+def test_close_stops_reaper() -> None:
+    client = HTTPClient(idle_ttl=60)
+
+    client.close()
+
+    assert client._reaper_stop.is_set()
+
+
+def test_no_proxies_without_config() -> None:
+    client = HTTPClient(trust_env=False)
+
+    assert client.proxies == {}
+    assert client._manager_for("https://example.com") is client.http
+
+
+def test_proxy_routing() -> None:
+    client = HTTPClient(
+        proxy="http://proxy.internal:3128",
+        no_proxy="localhost",
+        trust_env=False,
+    )
+
+    assert client.proxies["http"] is client.proxies["https"]
+    assert client._manager_for("https://example.com") is client.proxies["https"]
+    assert client._manager_for("http://localhost:8080") is client.http
+    assert len(client._managers()) == 2
+
+
+def test_scheme_less_env_proxy(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("HTTPS_PROXY", "proxy.corp:3128")
+    monkeypatch.delenv("https_proxy", raising=False)
+
+    client = HTTPClient()
+
+    assert client.proxy_urls["https"] == "http://proxy.corp:3128"
+    assert client.proxies["https"].proxy.host == "proxy.corp"
+
+
+def test_unusable_proxy_is_skipped(caplog: pytest.LogCaptureFixture) -> None:
+    client = HTTPClient(proxy="socks9://proxy.corp:1080", trust_env=False)
+
+    assert client.proxies == {}
+    assert client._manager_for("https://example.com") is client.http
+    assert "Ignoring https proxy socks9://proxy.corp:1080" in caplog.text
+
+
+def test_request_through_proxy(local_server: str) -> None:
+    client = HTTPClient(proxy=local_server, trust_env=False)
+
+    result = client.get("http://example.invalid/")
+
+    assert result.text == "ok"
+    client.close()
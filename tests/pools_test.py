@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import socket
+import time
+
+import pytest
+import urllib3
+from http_overeasy.pools import IdleTrackingHTTPConnectionPool
+from http_overeasy.pools import IdleTrackingHTTPSConnectionPool
+from http_overeasy.pools import POOL_CLASSES_BY_SCHEME
+from http_overeasy.pools import reap_idle
+from http_overeasy.pools import reap_idle_pool
+from http_overeasy.pools import warm_pool
+
+
+def _manager(maxsize: int) -> urllib3.PoolManager:
+    manager = urllib3.PoolManager(maxsize=maxsize)
+    manager.pool_classes_by_scheme = POOL_CLASSES_BY_SCHEME
+    return manager
+
+
+def _open_connections(pool: IdleTrackingHTTPConnectionPool) -> int:
+    assert pool.pool is not None
+    return sum(
+        conn is not None and conn.sock is not None for conn in list(pool.pool.queue)
+    )
+
+
+def test_pool_classes() -> None:
+    manager = _manager(1)
+
+    assert isinstance(
+        manager.connection_from_url("http://example.com"),
+        IdleTrackingHTTPConnectionPool,
+    )
+    assert isinstance(
+        manager.connection_from_url("https://example.com"),
+        IdleTrackingHTTPSConnectionPool,
+    )
+
+
+def test_put_conn_records_idle_since() -> None:
+    pool = IdleTrackingHTTPConnectionPool("example.com")
+    conn = pool._get_conn()
+
+    pool._put_conn(conn)
+
+    assert getattr(conn, "_overeasy_idle_since") <= time.monotonic()
+
+
+def test_warm_pool(local_server: str) -> None:
+    pool = _manager(3).connection_from_url(local_server)
+
+    assert warm_pool(pool, 3) == 3
+    assert _open_connections(pool) == 3
+    # Connections already open count toward the total
+    assert warm_pool(pool, 2) == 2
+    assert _open_connections(pool) == 3
+
+
+def test_warm_pool_capped_by_maxsize(local_server: str) -> None:
+    pool = _manager(2).connection_from_url(local_server)
+
+    assert warm_pool(pool, 5) == 2
+    assert _open_connections(pool) == 2
+
+
+def test_failed_warm_leaves_pool_usable() -> None:
+    # Accepts connections but never answers the TLS handshake
+    with socket.socket() as server:
+        server.bind(("127.0.0.1", 0))
+        server.listen()
+        pool = IdleTrackingHTTPSConnectionPool(
+            "127.0.0.1", server.getsockname()[1], timeout=0.1, retries=0
+        )
+
+        with pytest.raises(OSError):
+            warm_pool(pool, 1)
+
+        assert pool.pool is not None and list(pool.pool.queue) == [None]
+        with pytest.raises(urllib3.exceptions.MaxRetryError):
+            pool.urlopen("GET", "/")
+
+
+def test_reap_idle(local_server: str) -> None:
+    manager = _manager(2)
+    pool = manager.connection_from_url(local_server)
+    warm_pool(pool, 2)
+
+    assert reap_idle(manager, 60) == 0
+    assert _open_connections(pool) == 2
+
+    time.sleep(0.02)
+
+    assert reap_idle(manager, 0.01) == 2
+    assert _open_connections(pool) == 0
+    assert pool.pool is not None and pool.pool.qsize() == 2
+
+
+def test_reap_idle_pool_in_place(local_server: str) -> None:
+    pool = _manager(3).connection_from_url(local_server)
+    warm_pool(pool, 3)
+    assert pool.pool is not None
+    parked = list(pool.pool.queue)
+    setattr(parked[1], "_overeasy_idle_since", time.monotonic() - 120)
+
+    assert reap_idle_pool(pool, 60) == 1
+    # Only the expired slot is emptied, order and live connections are kept
+    assert list(pool.pool.queue) == [parked[0], None, parked[2]]
+    assert parked[0].sock is not None and parked[2].sock is not None
+    assert pool.pool.full()
+
+
+def test_reaped_pool_still_serves_requests(local_server: str) -> None:
+    manager = _manager(1)
+    manager.request("GET", local_server)
+    time.sleep(0.02)
+
+    reap_idle(manager, 0.01)
+    resp = manager.request("GET", local_server)
+
+    assert resp.status == 200
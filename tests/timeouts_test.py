@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import time
+from typing import Any
+
+import pytest
+from http_overeasy.timeouts import DeadlineExceededError
+from http_overeasy.timeouts import DeadlineRetry
+from http_overeasy.timeouts import DeadlineTimeout
+from http_overeasy.timeouts import PHASE_CONNECT
+from http_overeasy.timeouts import PHASE_DEADLINE
+from http_overeasy.timeouts import PHASE_READ
+from http_overeasy.timeouts import split_timeout
+from http_overeasy.timeouts import timeout_phase
+from urllib3.exceptions import ConnectTimeoutError
+from urllib3.exceptions import MaxRetryError
+from urllib3.exceptions import NewConnectionError
+from urllib3.exceptions import ReadTimeoutError
+
+
+def test_deadline_timeout_clamps_to_time_remaining() -> None:
+    timeout = DeadlineTimeout(10.0, 20.0, time.monotonic() + 1)
+
+    assert 0 < timeout.connect_timeout <= 1
+    assert 0 < timeout.read_timeout <= 1
+
+
+def test_deadline_timeout_keeps_shorter_limits() -> None:
+    timeout = DeadlineTimeout(0.1, 0.2, time.monotonic() + 60)
+
+    assert timeout.connect_timeout == 0.1
+    assert timeout.read_timeout == 0.2
+
+
+def test_deadline_timeout_unlimited_uses_time_remaining() -> None:
+    timeout = DeadlineTimeout(None, None, time.monotonic() + 1)
+
+    assert 0 < timeout.connect_timeout <= 1
+    assert 0 < timeout.read_timeout <= 1
+
+
+def test_deadline_timeout_never_zero() -> None:
+    timeout = DeadlineTimeout(1.0, 1.0, time.monotonic() - 1)
+
+    assert timeout.connect_timeout > 0
+    assert timeout.read_timeout > 0
+
+
+def test_deadline_timeout_clone_keeps_deadline() -> None:
+    timeout = DeadlineTimeout(1.0, 2.0, 123.0)
+
+    clone = timeout.clone()
+
+    assert isinstance(clone, DeadlineTimeout)
+    assert clone.expires == 123.0
+    assert clone._limits == (1.0, 2.0)
+
+
+def test_deadline_retry_new_keeps_deadline() -> None:
+    retry = DeadlineRetry(total=3, expires=123.0)
+
+    assert retry.new(total=2).expires == 123.0
+
+
+def test_deadline_retry_increment_within_deadline() -> None:
+    retry = DeadlineRetry(total=3, expires=time.monotonic() + 60)
+
+    result = retry.increment("GET", "/", error=ReadTimeoutError(None, "/", "t"))
+
+    assert result.total == 2
+    assert result.expires == retry.expires
+
+
+def test_deadline_retry_increment_past_deadline() -> None:
+    retry = DeadlineRetry(total=3, expires=time.monotonic() - 1)
+
+    with pytest.raises(DeadlineExceededError):
+        retry.increment("GET", "/", error=ReadTimeoutError(None, "/", "t"))
+
+
+def test_deadline_retry_backoff_past_deadline() -> None:
+    retry = DeadlineRetry(total=3, backoff_factor=60, expires=time.monotonic() + 5)
+    error = ReadTimeoutError(None, "/", "t")
+
+    retry = retry.increment("GET", "/", error=error)
+
+    with pytest.raises(DeadlineExceededError):
+        retry.increment("GET", "/", error=error)
+
+
+@pytest.mark.parametrize(
+    ("timeout", "expected"),
+    (
+        (None, (None, None)),
+        (1.0, (1.0, 1.0)),
+        ((1.0, 2.0), (1.0, 2.0)),
+    ),
+)
+def test_split_timeout(timeout: Any, expected: Any) -> None:
+    assert split_timeout(timeout) == expected
+
+
+@pytest.mark.parametrize(
+    ("error", "expected"),
+    (
+        (DeadlineExceededError(None, "/"), PHASE_DEADLINE),
+        (MaxRetryError(None, "/", ConnectTimeoutError()), PHASE_CONNECT),
+        (MaxRetryError(None, "/", ReadTimeoutError(None, "/", "t")), PHASE_READ),
+        (ReadTimeoutError(None, "/", "t"), PHASE_READ),
+        (MaxRetryError(None, "/", NewConnectionError(None, "refused")), None),
+        (MaxRetryError(None, "/", None), None),
+        (ValueError(), None),
+    ),
+)
+def test_timeout_phase(error: Exception, expected: str | None) -> None:
+    assert timeout_phase(error) == expected
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import socket
+import ssl
+import struct
+import threading
+from typing import Any
+from typing import Callable
+from typing import Generator
+from unittest.mock import patch
+
+import pytest
+from http_overeasy import http_client
+from http_overeasy.http_client import HTTPClient
+from http_overeasy.tls import build_ssl_context
+from http_overeasy.tls import SessionCachingContext
+from http_overeasy.tls import TLSStats
+from urllib3.exceptions import MaxRetryError
+
+
+@pytest.fixture(params=(ssl.TLSVersion.TLSv1_2, ssl.TLSVersion.TLSv1_3))
+def tls_server(
+    cert_file: str,
+    serve_local: Callable[..., str],
+    request: Any,
+) -> str:
+    """Local HTTPS server, returns the base url."""
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert_file, cert_file.replace("cert.pem", "key.pem"))
+    context.maximum_version = request.param
+    return serve_local(context)
+
+
+@pytest.fixture
+def resetting_server() -> Generator[str, None, None]:
+    """Listener that resets each connection once the ClientHello arrives."""
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen()
+
+    def serve() -> None:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            conn.recv(1024)
+            linger = struct.pack("ii", 1, 0)
+            conn.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, linger)
+            conn.close()
+
+    threading.Thread(target=serve, daemon=True).start()
+    yield f"https://127.0.0.1:{server.getsockname()[1]}"
+    server.close()
+
+
+def test_stats_average() -> None:
+    assert TLSStats(4, 2, 1.0).average_seconds == 0.25
+    assert TLSStats(0, 0, 0.0).average_seconds == 0.0
+
+
+def test_build_ssl_context_defaults() -> None:
+    context = build_ssl_context()
+
+    assert isinstance(context, SessionCachingContext)
+    assert context.verify_mode == ssl.CERT_REQUIRED
+    assert context.check_hostname is True
+    assert context.minimum_version == ssl.TLSVersion.TLSv1_2
+    assert context.stats == TLSStats(0, 0, 0.0)
+
+
+def test_build_ssl_context_ca_bundle(cert_file: str) -> None:
+    context = build_ssl_context(cert_file)
+
+    assert context.cert_store_stats()["x509_ca"] == 1
+
+
+def test_sessions_resumed_across_connections(tls_server: str, cert_file: str) -> None:
+    client = HTTPClient(ca_bundle=cert_file, trust_env=False)
+
+    for _ in range(3):
+        assert client.get(tls_server).text == "ok"
+        client.close()
+
+    stats = client.tls_stats
+    assert stats is not None
+    assert stats.handshakes == 3
+    assert stats.resumed == 2
+    assert stats.seconds > 0
+
+
+def test_context_shared_by_all_pools(tls_server: str, cert_file: str) -> None:
+    client = HTTPClient(ca_bundle=cert_file, trust_env=False)
+    other_host = tls_server.replace("localhost", "127.0.0.1")
+
+    pool_a = client.http.connection_from_url(tls_server)
+    pool_b = client.http.connection_from_url(other_host)
+
+    assert pool_a is not pool_b
+    assert pool_a.conn_kw["ssl_context"] is client.ssl_context
+    assert pool_b.conn_kw["ssl_context"] is client.ssl_context
+
+
+def test_user_context_has_no_stats() -> None:
+    client = HTTPClient(ssl_context=ssl.create_default_context())
+
+    assert client.tls_stats is None
+
+
+def test_failed_handshake_raises_connection_error(resetting_server: str) -> None:
+    with patch.object(http_client, "RETRY_TOTAL", 0):
+        client = HTTPClient(trust_env=False)
+
+        with pytest.raises(MaxRetryError):
+            client.get(f"{resetting_server}/")
+        assert client.warm([resetting_server]) == 0
+
+    assert client.tls_stats == TLSStats(0, 0, 0.0)
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from unittest.mock import patch
+from urllib import parse
+
+import pytest
+from http_overeasy import http_client
+from http_overeasy.http_client import HTTPClient
+from http_overeasy.unix import unix_target
+from http_overeasy.unix import UnixHTTPConnectionPool
+from http_overeasy.unix import UnixTarget
+from urllib3.exceptions import MaxRetryError
+from urllib3.exceptions import NewConnectionError
+
+SOCKET = "/var/run/agent.sock"
+
+
+@pytest.mark.parametrize(
+    ("url", "expected"),
+    (
+        (
+            f"http+unix://{parse.quote(SOCKET, safe='')}/v1/info?x=1",
+            UnixTarget(SOCKET, "localhost", "/v1/info?x=1"),
+        ),
+        (
+            f"HTTP+UNIX://{parse.quote(SOCKET, safe='')}",
+            UnixTarget(SOCKET, "localhost", "/"),
+        ),
+        ("http://agent/metrics", UnixTarget(SOCKET, "agent", "/metrics")),
+        ("http://AGENT:8080/", UnixTarget(SOCKET, "agent", "/")),
+        ("https://agent/metrics", None),
+        ("http://example.com/agent", None),
+    ),
+)
+def test_unix_target(url: str, expected: UnixTarget | None) -> None:
+    assert unix_target(url, {"agent": SOCKET}) == expected
+
+
+def test_request_over_socket_url(unix_server: str) -> None:
+    client = HTTPClient(trust_env=False)
+    url = f"http+unix://{parse.quote(unix_server, safe='')}/status/201"
+
+    result = client.post(url, json={"key": "value"})
+
+    assert result.status_code == 201
+    assert result.json() == {"key": "value"}
+    client.close()
+
+
+def test_request_over_mapped_host(unix_server: str) -> None:
+    client = HTTPClient(unix_sockets={"Agent": unix_server}, trust_env=False)
+
+    for _ in range(3):
+        assert client.get("http://agent/metrics", fields={"a": "b"}).text == "ok"
+
+    assert len(client.unix_pools) == 1
+    pool = next(iter(client.unix_pools.values()))
+    assert isinstance(pool, UnixHTTPConnectionPool)
+    assert pool.num_connections == 1
+    client.close()
+    assert client.unix_pools == {}
+
+
+def test_warm_socket_pool(unix_server: str) -> None:
+    client = HTTPClient(unix_sockets={"agent": unix_server}, pool_size=2)
+
+    assert client.warm(["http://agent"], connections_per_host=2) == 2
+    client.close()
+
+
+def test_missing_socket_fails_to_connect(tmp_path: str) -> None:
+    client = HTTPClient(unix_sockets={"agent": f"{tmp_path}/missing.sock"})
+
+    with patch.object(http_client, "RETRY_TOTAL", 0):
+        with pytest.raises(MaxRetryError) as err:
+            client.get("http://agent/")
+
+    assert isinstance(err.value.reason, NewConnectionError)